@@ -1,9 +1,32 @@
+import threading
 from .base import AgentState
 from .validation import validation_agent
 from .inference import inference_agent
-from .decision import decision_agent
-from .recommendation import recommendation_agent
-from .workflow import build_workflow
+from .decision import decision_agent, SYSTEM_PROMPT_ACCEPT, SYSTEM_PROMPT_DECLINE
+from .recommendation import recommendation_agent, SYSTEM_PROMPT_RECOMMEND
+from .workflow import build_workflow, lang_agent
+from .llm import warmup
+
+
+def start_warmup() -> threading.Thread:
+    """
+    Load the chat model and prefill the static system prompts in the background.
+    
+    Called once by the long-running servers (the API lifespan and the
+    Streamlit app), not at import, so the CLI and scripts that import
+    agents do not send requests to Ollama they never need.
+    
+    Returns:
+        The started daemon thread
+    """
+    thread = threading.Thread(
+        target=warmup,
+        args=(SYSTEM_PROMPT_RECOMMEND, SYSTEM_PROMPT_ACCEPT, SYSTEM_PROMPT_DECLINE),
+        name="ollama-warmup",
+        daemon=True
+    )
+    thread.start()
+    return thread
 
 __all__ = [
     "AgentState",
@@ -11,5 +34,7 @@ __all__ = [
     "inference_agent",
     "decision_agent",
     "recommendation_agent",
-    "build_workflow"
+    "build_workflow",
+    "lang_agent",
+    "start_warmup"
 ]
\ No newline at end of file
@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+from db_manager import DatabaseManager
+from utils.logger import setup_logger
+
+# Setup logger for the audit writer
+logger = setup_logger(f"Audit_{__name__}")
+
+# Maximum number of audit rows written in one commit
+BATCH_SIZE = 64
+# How long the writer waits for more rows before committing a partial batch
+BATCH_WAIT_SECONDS = 0.1
+# Rows held in memory at most; beyond this new rows are dropped, not blocked on
+QUEUE_MAXSIZE = 10_000
+
+_queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _drain():
+    """Writer loop: batches queued audit rows into one commit per flush."""
+    db = DatabaseManager()
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + BATCH_WAIT_SECONDS
+        try:
+            while len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                batch.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            pass
+
+        try:
+            db.log_agent_actions(batch)
+        except Exception as e:
+            logger.error(f" Could not write {len(batch)} audit row(s): {e}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _ensure_writer():
+    """Starts the background writer thread on first use."""
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_drain, name="audit-writer", daemon=True)
+            _writer.start()
+
+
+def log_agent_action(app_id, agent_name, agent_input, agent_output, action_description):
+    """
+    Queues an agent action for the audit log without blocking the caller.
+
+    Rows are written by a background thread, so the request path never
+    waits on the database. If the queue is full the row is dropped with a
+    warning. Same arguments as DatabaseManager.log_agent_action.
+    """
+    _ensure_writer()
+    try:
+        _queue.put_nowait({
+            "app_id": app_id,
+            "agent_name": agent_name,
+            "agent_input": agent_input,
+            "agent_output": agent_output,
+            "action_description": action_description
+        })
+    except queue.Full:
+        logger.warning(f" Audit queue full, dropped {agent_name} row for {app_id}")
+
+
+def flush():
+    """Blocks until every queued audit row has been written."""
+    if _writer is not None:
+        _queue.join()
@@ -1,4 +1,4 @@
-from typing import TypedDict, List, Any, NotRequired
+from typing import TypedDict, List, NotRequired
 
 class AgentState(TypedDict):
     """
@@ -13,7 +13,7 @@ class AgentState(TypedDict):
     
     # Validation & Decision Results
     validation_errors: List[str]
-    is_eligible: bool
+    is_eligible: int  # 0 or 1 (ML prediction)
     
     # Inference Agent Output
     features: NotRequired[dict]  # Extracted features for ML model
@@ -24,6 +24,7 @@ class AgentState(TypedDict):
     decision_reason: str  # AI-generated reason
     final_decision: str  # User-facing message
     recommendation: str  # Support pathway
+    cached: NotRequired[bool]  # Recommendation served from the LLM response cache
     
     # Logging & Metadata
     logs: List[str]
\ No newline at end of file
@@ -1,13 +1,90 @@
-import ollama
+import logging
 from .base import AgentState
-from db_manager import DatabaseManager
-from config import OLLAMA_MODEL
+from . import audit
+from .llm import aclient, brief_chat, CONTEXT_OPTIONS
+from config import OLLAMA_MODEL, OLLAMA_KEEP_ALIVE
 from utils.logger import setup_logger
 
 # Setup logger for this agent
 logger = setup_logger(f"Decision_{__name__}")
 
-def decision_agent(state: AgentState) -> dict:
+# Static decision instructions. Keep applicant data out of these strings so
+# Ollama can reuse the cached prompt prefix across applications.
+SYSTEM_PROMPT_ACCEPT = """You are a compassionate government support officer explaining an ACCEPTED eligibility decision to an applicant.
+
+DECISION: The applicant in the user message has been APPROVED for government support.
+
+Generate a brief, warm, and encouraging explanation (2-3 sentences) that:
+1. Thanks them for applying
+2. Explains specifically why they qualified based on their actual data
+3. Briefly mentions what support they can expect
+
+Focus on their actual circumstances: income level, dependents, disability/medical needs, employment status.
+Be warm and supportive in tone."""
+
+SYSTEM_PROMPT_DECLINE = """Decision: SOFT DECLINE
+
+Write a brief decline message (2-3 sentences) for the applicant in the user message that:
+1. Thanks them for applying
+2. Explains why based ONLY on the actual data provided
+3. Encourages reapplication if circumstances change
+
+CRITICAL RULES:
+- Do NOT invent threshold values (like "18,818 AED" or "minimum salary")
+- Do NOT mention criteria not shown in the applicant data
+- Do NOT add technical terms or codes
+- Reference ONLY the actual numbers: monthly_income, total_savings, dependents
+- If employed: mention their employment and actual income
+- If unemployed: mention their actual savings amount
+- If no disability/medical severity = 0: state "no medical condition identified"
+- If disability/medical severity > 0: acknowledge the medical need
+- Keep tone professional and empathetic
+- Maximum 3 sentences"""
+
+# Applicant profile sent as the user message
+_APPLICANT_INFO_TEMPLATE = """
+    APPLICANT PROFILE INFORMATION:
+    - Applicant: {name}
+    - Age: {age}
+    - Marital Status: {marital_status}
+    - Family Size: {family_size}
+    - Dependents: {dependents}
+    - Monthly Income: {monthly_income:.0f} AED
+    - Total Savings: {total_savings:.0f} AED
+    - Employment Status: {employment_status}
+    - Has Disability: {has_disability}
+    - Medical Severity: {medical_severity}"""
+
+_PROFILE_DEFAULTS = {
+    'age': 'N/A',
+    'marital_status': 'N/A',
+    'family_size': 'N/A',
+    'dependents': 'N/A',
+    'employment_status': 'N/A',
+    'monthly_income': 0,
+    'total_savings': 0,
+    'medical_severity': 0
+}
+
+async def warm_decision_model() -> None:
+    """
+    Loads the decision model into Ollama ahead of the real request.
+    
+    An empty generate call only loads the weights, so it can be issued
+    while the ML prediction is still running. Failures are ignored; the
+    decision call itself reports any real connectivity problem.
+    """
+    try:
+        await aclient.generate(
+            model=OLLAMA_MODEL,
+            prompt="",
+            options=CONTEXT_OPTIONS,
+            keep_alive=OLLAMA_KEEP_ALIVE
+        )
+    except Exception as e:
+        logger.debug(f" Decision model warm-up skipped: {e}")
+
+async def decision_agent(state: AgentState) -> dict:
     """
     Translates ML prediction to human-friendly final decision.
     
@@ -19,8 +96,6 @@ def decision_agent(state: AgentState) -> dict:
     Returns:
         Dictionary with final decision and data-driven reasoning
     """
-    db = DatabaseManager()
-    
     logger.info("Decision Agent Started")
 
     # Extract data from state
@@ -33,103 +108,43 @@ def decision_agent(state: AgentState) -> dict:
     logger.info(f"  Applicant: {name}")
     logger.info(f"  ML Prediction: {'ELIGIBLE' if is_eligible else 'NOT ELIGIBLE'}")
     logger.info(f"  Confidence: {confidence:.2%}")
-    print(f"Decision Agent - State keys: {state.keys()}")
-    print(f"Decision Agent - Features received: {features}")
-    print(f"Decision Agent - UI Data: {ui_data}")
-    
-    # If features are empty or missing, use ui_data as fallback
-    if not features or all(v == 0 or v is None for v in features.values()):
-        print("⚠️  Features empty, using ui_data as fallback...")
-        features = {
-            'age': ui_data.get('age', 0),
-            'marital_status': ui_data.get('marital_status', 0),
-            'family_size': ui_data.get('family_size', 0),
-            'dependents': ui_data.get('dependents', 0),
-            'monthly_income': ui_data.get('monthly_income', 0),
-            'total_savings': ui_data.get('total_savings', 0),
-            'property_value': ui_data.get('property_value', 0),
-            'has_disability': ui_data.get('has_disability', 0),
-            'medical_severity': ui_data.get('medical_severity', 0),
-            'employment_status': ui_data.get('employment_status', 0)
-        }
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("features=%s", features)
     
     # Determine outcome
     outcome = "ACCEPTED" if is_eligible else "SOFT DECLINE"
     
-    print("Features used for decision reasoning:", features)
     # Generate user-facing message
     if outcome == "ACCEPTED":
         msg = f"Congratulations {name}, your application is accepted."
     else:
         msg = f"Sorry {name}, your application has been soft declined based on eligibility rules."
     
-    # Build applicant info from actual data
-    applicant_info = f"""
-    APPLICANT PROFILE INFORMATION:
-    - Applicant: {name}
-    - Age: {ui_data.get('age', 'N/A')}
-    - Marital Status: {ui_data.get('marital_status', 'N/A')}
-    - Family Size: {ui_data.get('family_size', 'N/A')}
-    - Dependents: {ui_data.get('dependents', 'N/A')}
-    - Monthly Income: {features.get('monthly_income', 0):.0f} AED
-    - Total Savings: {features.get('total_savings', 0):.0f} AED
-    - Employment Status: {ui_data.get('employment_status', 'N/A')}
-    - Has Disability: {'Yes' if features.get('has_disability', 0) == 1 else 'No'}
-    - Medical Severity: {features.get('medical_severity', 0)}"""
+    # Build applicant info from the features set by the inference agent;
+    # demographics come from the form as entered
+    profile = {**_PROFILE_DEFAULTS, **features, **ui_data}
+    profile['name'] = name
+    profile['has_disability'] = 'Yes' if features.get('has_disability', 0) == 1 else 'No'
+    applicant_info = _APPLICANT_INFO_TEMPLATE.format_map(profile)
     
-    print("Features used for decision reasoning:", features)
-    print(f"Applicant Info for Reasoning: {applicant_info}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("applicant_info=%s", applicant_info)
     
-    # Create prompt with applicant data
-    if outcome == "ACCEPTED":
-        prompt = f"""You are a compassionate government support officer explaining an ACCEPTED eligibility decision to an applicant.
-
-{applicant_info}
-
-DECISION: This applicant has been APPROVED for government support.
-
-Generate a brief, warm, and encouraging explanation (2-3 sentences) that:
-1. Thanks them for applying
-2. Explains specifically why they qualified based on their actual data
-3. Briefly mentions what support they can expect
-
-Focus on their actual circumstances: income level, dependents, disability/medical needs, employment status.
-Be warm and supportive in tone."""
-    else:
-        prompt = f"""{applicant_info}
-
-Decision: SOFT DECLINE
-
-Write a brief decline message (2-3 sentences) for this applicant that:
-1. Thanks them for applying
-2. Explains why based ONLY on the actual data provided above
-3. Encourages reapplication if circumstances change
-
-CRITICAL RULES:
-- Do NOT invent threshold values (like "18,818 AED" or "minimum salary")
-- Do NOT mention criteria not shown in the data above
-- Do NOT add technical terms or codes
-- Reference ONLY the actual numbers: monthly_income, total_savings, dependents
-- If employed: mention their employment and actual income
-- If unemployed: mention their actual savings amount
-- If no disability/medical severity = 0: state "no medical condition identified"
-- If disability/medical severity > 0: acknowledge the medical need
-- Keep tone professional and empathetic
-- Maximum 3 sentences"""
+    # Static instructions go in the system message so the prompt prefix is
+    # identical across applicants; only the profile varies
+    system_prompt = SYSTEM_PROMPT_ACCEPT if outcome == "ACCEPTED" else SYSTEM_PROMPT_DECLINE
 
     logger.info(" Sending to LLM for decision reasoning...")
     
     # Generate AI reasoning based on actual data
     try:
-        resp = ollama.chat(
-            model=OLLAMA_MODEL,
-            messages=[{'role': 'user', 'content': prompt}]
-        )
-        reason = resp['message']['content'].strip()
-        logger.info(f" LLM reasoning generated successfully")
-        logger.info(f"   Reason: {reason}")
+        reason = await brief_chat([
+            {'role': 'system', 'content': system_prompt},
+            {'role': 'user', 'content': applicant_info}
+        ])
+        logger.info(" LLM reasoning generated successfully")
+        logger.debug("reason=%s", reason)
     except Exception as e:
-        print(f"❌ Ollama error: {e}")
         logger.error(f" Ollama error: {e}")
         reason = "Unable to generate reasoning at this time."
     
@@ -142,19 +157,16 @@ CRITICAL RULES:
     
     # Log agent action
     try:
-        db.log_agent_action(
+        audit.log_agent_action(
         app_id=state['application_id'],
         agent_name="decider",
         agent_input={"is_eligible": is_eligible},
         agent_output=result,
         action_description=f"Decision: {outcome}"
         )
-        logger.info(f" Agent action logged to database")
+        logger.info(f" Agent action queued for audit log")
     except Exception as log_err:
         logger.error(f"  Could not log decision action: {log_err}")
     
-    db.close()
-    
-    print(f"✅ Decision Agent: {outcome}")
-    logger.info(f" Decision Agent Complete: {outcome} (Confidence: {confidence:.2%})\n")
+    logger.info(" Decision Agent Complete: decision=%s conf=%.3f", outcome, confidence)
     return result
\ No newline at end of file
@@ -0,0 +1,166 @@
+import re
+import asyncio
+import threading
+import ollama
+import orjson
+from config import (
+    OLLAMA_MODEL,
+    OLLAMA_HOST,
+    OLLAMA_TIMEOUT,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_NUM_CTX,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS
+)
+from utils.llm_cache import LLMCache
+
+# One client per process, so every agent call reuses the same keep-alive
+# connection pool instead of opening a new connection to Ollama
+aclient = ollama.AsyncClient(host=OLLAMA_HOST, timeout=OLLAMA_TIMEOUT)
+client = ollama.Client(host=OLLAMA_HOST, timeout=OLLAMA_TIMEOUT)
+
+# Responses for deterministic prompts, keyed by a hash of model + prompt inputs
+response_cache = LLMCache(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+
+# Every request uses the same context size; Ollama reloads the model when
+# num_ctx changes, and the agent prompts fit comfortably in 2k tokens
+CONTEXT_OPTIONS = {'num_ctx': OLLAMA_NUM_CTX}
+
+# Decoding options for the short 2-3 sentence agent replies
+BRIEF_OPTIONS = {
+    **CONTEXT_OPTIONS,
+    'num_predict': 150,
+    'temperature': 0.3
+}
+
+# Greedy decoding for structured replies, so identical prompts give
+# identical (cacheable) output
+STRUCTURED_OPTIONS = {
+    **CONTEXT_OPTIONS,
+    'num_predict': 128,
+    'temperature': 0.0,
+    'top_k': 1
+}
+
+# A sentence ends at . ! or ? followed by whitespace (so "5,000.00" does not count)
+_SENTENCE_END_RE = re.compile(r'[.!?]\s')
+
+
+def warmup(*system_prompts) -> None:
+    """
+    Loads the chat model into Ollama and keeps it resident.
+    
+    Run once in a background thread by agents.start_warmup(), which the
+    API lifespan and the Streamlit app call at startup (the CLI and
+    scripts do not), so the first applicant does not pay the model load. An empty prompt only loads the weights;
+    each given system prompt is then prefilled with a one-token request
+    so its KV cache is ready for the first real call.
+    Failures are ignored (Ollama may not be running yet).
+    """
+    try:
+        client.generate(
+            model=OLLAMA_MODEL,
+            prompt="",
+            options=CONTEXT_OPTIONS,
+            keep_alive=OLLAMA_KEEP_ALIVE
+        )
+        for system_prompt in system_prompts:
+            client.chat(
+                model=OLLAMA_MODEL,
+                messages=[{'role': 'system', 'content': system_prompt}],
+                options={**CONTEXT_OPTIONS, 'num_predict': 1},
+                keep_alive=OLLAMA_KEEP_ALIVE
+            )
+    except Exception:
+        pass
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro):
+    """
+    Runs a coroutine from synchronous code on one long-lived event loop.
+    
+    The shared async client's connections belong to the loop that opened
+    them, so sync callers (Streamlit reruns) must not spin up a fresh loop
+    with asyncio.run for every request.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+async def brief_chat(messages, max_sentences: int = 3) -> str:
+    """
+    Streams a chat completion and stops once enough sentences have arrived.
+
+    Decode time grows with every generated token, so the stream is closed
+    as soon as max_sentences complete sentences are available instead of
+    waiting for trailing filler.
+
+    Args:
+        messages: Chat messages
+        max_sentences: Number of sentences to keep
+
+    Returns:
+        Reply text, trimmed to at most max_sentences sentences
+    """
+    stream = await aclient.chat(
+        model=OLLAMA_MODEL,
+        messages=messages,
+        stream=True,
+        options=BRIEF_OPTIONS,
+        keep_alive=OLLAMA_KEEP_ALIVE
+    )
+    text = ""
+    try:
+        async for chunk in stream:
+            text += chunk['message']['content']
+            ends = list(_SENTENCE_END_RE.finditer(text))
+            if len(ends) >= max_sentences:
+                text = text[:ends[max_sentences - 1].start() + 1]
+                break
+    finally:
+        await stream.aclose()
+    return text.strip()
+
+
+async def json_chat(messages, schema: dict) -> dict:
+    """
+    Requests a reply constrained to a JSON schema and parses it.
+
+    Ollama applies the schema as a decoding grammar, so the model can only
+    emit matching JSON and stops once the object is closed.
+
+    Args:
+        messages: Chat messages
+        schema: JSON schema for the reply
+
+    Returns:
+        Parsed reply object
+
+    Raises:
+        ValueError: If the reply is not a JSON object
+    """
+    resp = await aclient.chat(
+        model=OLLAMA_MODEL,
+        messages=messages,
+        format=schema,
+        options=STRUCTURED_OPTIONS,
+        keep_alive=OLLAMA_KEEP_ALIVE
+    )
+    reply = orjson.loads(resp['message']['content'])
+    if not isinstance(reply, dict):
+        raise ValueError(f"Expected a JSON object, got {type(reply).__name__}")
+    return reply
@@ -1,13 +1,98 @@
-import ollama
+import logging
+from typing import List, Optional, Tuple
 from .base import AgentState
-from db_manager import DatabaseManager
+from . import audit
+from .llm import response_cache, json_chat
 from config import OLLAMA_MODEL
+from utils.llm_cache import make_key
 from utils.logger import setup_logger
 
 # Setup logger for this agent
 logger = setup_logger(f"Recommendation_{__name__}")
 
-def recommendation_agent(state: AgentState) -> dict:
+# Static recommender instructions, identical for every applicant so Ollama
+# can reuse the cached prompt prefix. Applicant data goes in the user message.
+SYSTEM_PROMPT_RECOMMEND = """You are a support pathway recommender. IMPORTANT: You MUST ONLY reference the applicant's PROVIDED DATA in the user message. Do NOT add, assume, or generate any information not explicitly provided.
+
+TASK: Based ONLY on the provided data, recommend ONE of:
+1. "Financial Support" - Direct monetary aid for immediate needs.
+    Choose if applicant has disability,  medical severity greater than 3, income less than 10000 or dependents are greater than 3
+2. "Economic Enablement" - Job training/coaching for long-term stability 
+    Choose if applicant is unemployed, work experience available, dependents less than or equal to 3)
+
+RULES:
+- Reference ONLY the data provided
+- Do NOT mention programs, allowances, or benefits not listed
+- Do NOT assume anything about their situation
+- Keep the rationale to 2-3 sentences maximum
+- Be specific about which data points drove your recommendation
+
+Respond as JSON: {"category": "Financial Support" or "Economic Enablement", "rationale": "..."}"""
+
+# Reply schema enforced by Ollama's structured output
+RECOMMENDATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "category": {"type": "string", "enum": ["Financial Support", "Economic Enablement"]},
+        "rationale": {"type": "string"}
+    },
+    "required": ["category", "rationale"]
+}
+
+
+async def _llm_recommend(messages) -> str:
+    """Ask the model for a schema-constrained pathway and format it for the applicant."""
+    reply = await json_chat(messages, RECOMMENDATION_SCHEMA)
+    category = reply.get('category')
+    rationale = str(reply.get('rationale', '')).strip()
+    if category not in ("Financial Support", "Economic Enablement"):
+        raise ValueError(f"Unexpected recommendation category: {category!r}")
+    return f"{category} is recommended. {rationale}".strip()
+
+def _rule_decide(features: dict, ui_data: dict, extracted_data: dict) -> Optional[Tuple[str, List[str]]]:
+    """
+    Applies the recommendation rules when exactly one pathway qualifies.
+    
+    Args:
+        features: Features from the inference agent
+        ui_data: Form demographics
+        extracted_data: Document verification summaries
+        
+    Returns:
+        (pathway, driving data points), or None if neither or both pathways
+        qualify and the LLM should weigh the profile
+    """
+    income = features.get('monthly_income', 0)
+    severity = features.get('medical_severity', 0)
+    dependents = int(ui_data.get('dependents', 0) or 0)
+    unemployed = str(ui_data.get('employment_status', '')).lower() == 'unemployed'
+    resume = extracted_data.get('Resume', '')
+    has_experience = bool(resume) and 'N/A' not in resume
+    
+    financial = []
+    if features.get('has_disability', 0) == 1:
+        financial.append("a reported disability")
+    if severity > 3:
+        financial.append(f"a medical severity score of {severity}")
+    if income < 10000:
+        financial.append(f"a monthly income of {income:.0f} AED")
+    if dependents > 3:
+        financial.append(f"{dependents} dependents")
+    
+    enablement = unemployed and has_experience and dependents <= 3
+    
+    if financial and not enablement:
+        return "Financial Support", financial
+    if enablement and not financial:
+        return "Economic Enablement", [
+            "current unemployment",
+            "available work experience",
+            f"{dependents} dependents"
+        ]
+    return None
+
+
+async def recommendation_agent(state: AgentState) -> dict:
     """
     Suggests personalized support pathway for ACCEPTED applicants using LLM.
     
@@ -24,54 +109,65 @@ def recommendation_agent(state: AgentState) -> dict:
     Returns:
         Dictionary with personalized recommendation
     """
-    db = DatabaseManager()
-
     logger.info(" Recommendation Agent Started")
     
     # Only provide recommendations for accepted applicants
     if state.get('status') != "ACCEPTED":
         logger.info("  Applicant not accepted, skipping recommendation")
         result = {"recommendation": "N/A"}
-        db.close()
         return result
     
     # Extract ONLY provided data from state
     ui_data = state.get('ui_data', {})
     features = state.get('features', {})
     extracted_data = state.get('extracted_data', {})
+    
+    # Look each field up once
+    name = ui_data.get('name', 'N/A')
+    employment_status = ui_data.get('employment_status', 'N/A')
+    monthly_income = features.get('monthly_income', 0)
+    has_disability = features.get('has_disability', 0)
+    medical_severity = features.get('medical_severity', 0)
 
-    print("Features used for recommendation reasoning:", features)
-
-    logger.info(f"   Name: {ui_data.get('name', 'N/A')}")
-    logger.info(f"   Employment Status: {ui_data.get('employment_status', 'N/A')}")
-    logger.info(f"   Has Disability: {features.get('has_disability', 0)}")
-    logger.info(f"   Monthly Income: {features.get('monthly_income', 0):.0f} AED")
+    logger.info("   Name: %s", name)
+    logger.info("   Employment Status: %s", employment_status)
+    logger.info("   Has Disability: %s", has_disability)
+    logger.info("   Monthly Income: %.0f AED", monthly_income)
     
     # Build applicant profile from ONLY provided data
     profile = {
-        "Name": ui_data.get('name', 'N/A'),
+        "Name": name,
         "Age": ui_data.get('age', 0),
         "Marital Status": ui_data.get('marital_status', 'N/A'),
         "Family Size": ui_data.get('family_size', 0),
         "Dependents": ui_data.get('dependents', 0),
-        "Employment Status": ui_data.get('employment_status', 'N/A'),
-        "Monthly Income": f"{features.get('monthly_income', 0):.0f} AED",
+        "Employment Status": employment_status,
+        "Monthly Income": f"{monthly_income:.0f} AED",
         "Total Savings": f"{features.get('total_savings', 0):.0f} AED",
         "Property Value": f"{features.get('property_value', 0):.0f} AED",
-        "Has Disability": "Yes" if features.get('has_disability', 0) == 1 else "No",
-        "Medical Severity": features.get('medical_severity', 0),
+        "Has Disability": "Yes" if has_disability == 1 else "No",
+        "Medical Severity": medical_severity,
         "Medical Report": extracted_data.get('Medical Report', 'No medical conditions reported'),
         "Work Experience": extracted_data.get('Resume', 'No work experience provided'),
     }
     
-    print(f"\n📋 Recommendation Agent - Profile Data:")
-    for key, value in profile.items():
-        print(f"   {key}: {value}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("profile=%s", profile)
     
-    # Create strict prompt that constrains LLM to provided data ONLY
-    prompt = f"""You are a support pathway recommender. IMPORTANT: You MUST ONLY reference the applicant's PROVIDED DATA below. Do NOT add, assume, or generate any information not explicitly provided.
-
-APPLICANT PROVIDED DATA:
+    # Clear-cut cases follow the recommendation rules directly; only
+    # ambiguous profiles go to the LLM
+    rule = _rule_decide(features, ui_data, extracted_data)
+    if rule is not None:
+        category, reasons = rule
+        recommendation = (
+            f"{category} is recommended based on your provided data. "
+            f"This is driven by {' and '.join(reasons)}."
+        )
+        cached = False
+        logger.info(" Rule-based recommendation: %s (LLM skipped)", category)
+    else:
+        # Only the applicant data varies; the instructions are the shared system prefix
+        user_msg = f"""APPLICANT PROVIDED DATA:
 - Name: {profile['Name']}
 - Age: {profile['Age']}
 - Marital Status: {profile['Marital Status']}
@@ -86,67 +182,51 @@ APPLICANT PROVIDED DATA:
 - Medical Report: {profile['Medical Report']}
 - Work Experience: {profile['Work Experience']}
 
-TASK: Based ONLY on the data above, recommend ONE of:
-1. "Financial Support" - Direct monetary aid for immediate needs.
-    Choose if applicant has disability,  medical severity greater than 3, income less than 10000 or dependents are greater than 3
-2. "Economic Enablement" - Job training/coaching for long-term stability 
-    Choose if applicant is unemployed, work experience available, dependents less than or equal to 3)
-
-RULES:
-- Reference ONLY the data provided above
-- Do NOT mention programs, allowances, or benefits not listed
-- Do NOT assume anything about their situation
-- Keep recommendation to 2-3 sentences maximum
-- Be specific about which data points drove your recommendation
-
 Recommendation:"""
+        
+        logger.info(" Sending to LLM for recommendation...")
+        
+        # Generate AI recommendation with constrained prompt
+        try:
+            recommendation, cached = await response_cache.get_or_compute(
+                make_key(OLLAMA_MODEL, profile),
+                lambda: _llm_recommend([
+                    {'role': 'system', 'content': SYSTEM_PROMPT_RECOMMEND},
+                    {'role': 'user', 'content': user_msg}
+                ])
+            )
+            logger.info(" LLM Recommendation generated successfully%s", " (cached)" if cached else "")
+            logger.info("   Recommendation: %s", recommendation)
+        except Exception as e:
+            logger.error(" Ollama error: %s", e)
+            cached = False
+            # Fallback recommendation based on data
+            if has_disability == 1 or medical_severity > 0:
+                recommendation = "Financial Support is recommended based on your disability status and medical needs."
+            elif str(employment_status).lower() == 'unemployed':
+                recommendation = "Economic Enablement is recommended to help you secure employment and build long-term stability."
+            else:
+                recommendation = "Unable to generate recommendation at this time."
+            logger.warning("  Using fallback recommendation: %s", recommendation)
     
-    logger.info(" Sending to LLM for recommendation...")
-    
-    # Generate AI recommendation with constrained prompt
-    try:
-        resp = ollama.chat(
-            model=OLLAMA_MODEL,
-            messages=[{'role': 'user', 'content': prompt}]
-        )
-        recommendation = resp['message']['content'].strip()
-        logger.info(f" LLM Recommendation generated successfully")
-        logger.info(f"   Recommendation: {recommendation}")
-        print(f"✅ LLM Response received")
-    except Exception as e:
-        print(f"❌ Ollama error: {e}")
-        logger.error(f" Ollama error: {e}")
-        # Fallback recommendation based on data
-        if features.get('has_disability', 0) == 1 or features.get('medical_severity', 0) > 0:
-            recommendation = "Financial Support is recommended based on your disability status and medical needs."
-        elif ui_data.get('employment_status', '').lower() == 'unemployed':
-            recommendation = "Economic Enablement is recommended to help you secure employment and build long-term stability."
-        else:
-            recommendation = "Unable to generate recommendation at this time."
-        logger.warning(f"  Using fallback recommendation: {recommendation}")
-    
-    # Build result
+    # Build result (the profile is kept in the audit row only, not in state)
     result = {
         "recommendation": recommendation,
-        "profile_data": profile
+        "cached": cached
     }
     
     # Log agent action
     try:
-        db.log_agent_action(
+        audit.log_agent_action(
             app_id=state.get('application_id', 'unknown'),
             agent_name="advisor",
             agent_input={"profile": profile},
             agent_output=result,
             action_description=f"Recommendation generated based on provided data"
         )
-        logger.info(f" Agent action logged to database")
+        logger.info(" Agent action queued for audit log")
     except Exception as log_err:
-        print(f"⚠️  Warning: Could not log recommendation action: {log_err}")
-        logger.error(f"  Could not log recommendation action: {log_err}")
-    
-    db.close()
+        logger.error("  Could not log recommendation action: %s", log_err)
     
-    print(f"✅ Recommendation Agent Complete")
-    logger.info(f" Recommendation Agent Complete\n")
+    logger.info(" Recommendation Agent Complete\n")
     return result
\ No newline at end of file
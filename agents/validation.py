@@ -1,89 +1,101 @@
 import re
+from functools import lru_cache
 from .base import AgentState
-from db_manager import DatabaseManager
-from utils import clean_val
+from . import audit
+from utils import extract_fields
 from utils.logger import setup_logger
 
 # Setup logger for this agent
 logger = setup_logger(f"Validation_{__name__}")
 
-def clean_val_local(val_str):
-    """Robustly extracts numbers from any formatted string."""
-    if not val_str:
-        return 0.0
-    clean_num = re.sub(r'[^\d.]', '', str(val_str))
-    return float(clean_num) if clean_num else 0.0
+# Document keys
+BANK_KEY = "Bank Statement"
+CREDIT_KEY = "Credit Report"
+EID_KEY = "Emirates ID"
 
+# Identity failure marker and its detail, e.g. "❌ Fail (ID missing in Bank Statement)"
+_FAIL_RE = re.compile(r'\S* Fail[^\n]*')
 
-def validation_agent(state: AgentState) -> dict:
+
+@lru_cache(maxsize=1024)
+def _find_mismatches(ext_items: tuple, ui_fam: int) -> tuple:
     """
-    Validates document consistency and reports specific failures.
-    
-    Checks:
-    1. Identity validation (ID & Address match across documents)
-    2. Income consistency between Bank Statement & Credit Report
-    3. Family size consistency between UI form & Emirates ID
+    Runs the consistency checks on extracted data (pure, so it is memoized).
     
     Args:
-        state: Agent state with extracted data
+        ext_items: Sorted (document name, verification summary) pairs
+        ui_fam: Family size entered on the form
         
     Returns:
-        Dictionary with validation results
+        Tuple of mismatch descriptions (empty if all checks pass)
     """
-    db = DatabaseManager()
-
-    logger.info(" Validation Agent Started")
-    
-    ext = state['extracted_data']
-    name = state['ui_data'].get('name', 'Applicant')
-    
-    logger.info(f"   Applicant: {name}")
-    logger.info(f" Validating document consistency...")
-
-    # Document keys
-    bank_key = "Bank Statement"
-    credit_key = "Credit Report"
-    eid_key = "Emirates ID"
-    
+    ext = dict(ext_items)
     mismatches = []
     
     # ===== CHECK 1: Identity Failures =====
-    for doc_name, doc_content in ext.items():
-        if " Fail" in doc_content:
-            error_details = doc_content.split("Identity: ")[1] if "Identity: " in doc_content else doc_content
+    for doc_name, doc_content in ext_items:
+        m = _FAIL_RE.search(doc_content)
+        if m:
+            error_details = m.group(0)
             mismatches.append(error_details)
-            logger.warning(f"  Identity failure in {doc_name}: {error_details}")
+            logger.warning("  Identity failure in %s: %s", doc_name, error_details)
     
     # ===== CHECK 2: Income Consistency =====
-    bank_sal = clean_val_local(
-        re.search(r'Salary:\s*([\d,.]+)', ext.get(bank_key, '')).group(1)
-        if 'Salary:' in ext.get(bank_key, '') else 0.0
-    )
-    credit_inc = clean_val_local(
-        re.search(r'Income:\s*([\d,.]+)', ext.get(credit_key, '')).group(1)
-        if 'Income:' in ext.get(credit_key, '') else 0.0
-    )
+    bank_sal = extract_fields(ext.get(BANK_KEY, '')).get('Salary', 0.0)
+    credit_inc = extract_fields(ext.get(CREDIT_KEY, '')).get('Income', 0.0)
     
     if abs(bank_sal - credit_inc) > 500:
         mismatches.append(
-            f"salary mismatch: {bank_key}={bank_sal}, {credit_key}={credit_inc}"
+            f"salary mismatch: {BANK_KEY}={bank_sal}, {CREDIT_KEY}={credit_inc}"
         )
     
     # ===== CHECK 3: Family Size Consistency =====
-    eid_fam = int(clean_val_local(
-        re.search(r'Family:\s*(\d+)', ext.get(eid_key, '')).group(1)
-        if 'Family:' in ext.get(eid_key, '') else 0
-    ))
-    ui_fam = int(state['ui_data'].get('family_size', 0))
+    eid_fam = int(extract_fields(ext.get(EID_KEY, '')).get('Family', 0))
     
     if ui_fam != eid_fam:
         mismatches.append(
             f"family size mismatch: form={ui_fam}, ID={eid_fam}"
         )
     
+    return tuple(mismatches)
+
+
+def validation_agent(state: AgentState) -> dict:
+    """
+    Validates document consistency and reports specific failures.
+    
+    Checks:
+    1. Identity validation (ID & Address match across documents)
+    2. Income consistency between Bank Statement & Credit Report
+    3. Family size consistency between UI form & Emirates ID
+    
+    Args:
+        state: Agent state with extracted data
+        
+    Returns:
+        Dictionary with validation results
+    """
+    logger.info(" Validation Agent Started")
+    
+    ext = state['extracted_data']
+    ui = state['ui_data']
+    name = ui.get('name', 'Applicant')
+    
+    logger.info("   Applicant: %s", name)
+    logger.info(" Validating document consistency...")
+
+    # Identical resubmissions hit the cache; inputs carrying identity
+    # failures are always re-checked
+    ext_items = tuple(sorted(ext.items()))
+    ui_fam = int(ui.get('family_size', 0))
+    if any(_FAIL_RE.search(content) for _, content in ext_items):
+        mismatches = list(_find_mismatches.__wrapped__(ext_items, ui_fam))
+    else:
+        mismatches = list(_find_mismatches(ext_items, ui_fam))
+    
     # ===== BUILD RESULT =====
     if mismatches:
-        logger.warning(f" Validation FAILED with {len(mismatches)} mismatch(es)")
+        logger.warning(" Validation FAILED with %d mismatch(es)", len(mismatches))
         result = {
             "status": "REJECTED",
             "final_decision": f"Sorry {name}, your application is rejected.",
@@ -91,9 +103,9 @@ def validation_agent(state: AgentState) -> dict:
             "is_eligible": 0,
             "validation_errors": mismatches
         }
-        logger.info(f"   Rejection Reason: {result['decision_reason']}")
+        logger.info("   Rejection Reason: %s", result['decision_reason'])
     else:
-        logger.info(f" Validation PASSED - All checks successful")
+        logger.info(" Validation PASSED - All checks successful")
         result = {
             "status": "VALIDATED",
             "final_decision": f"Hello {name}, your documents have been verified successfully.",
@@ -104,19 +116,16 @@ def validation_agent(state: AgentState) -> dict:
     
     # Log agent action
     try:
-        db.log_agent_action(
+        audit.log_agent_action(
         app_id=state['application_id'],
         agent_name="validator",
         agent_input={"extracted_data": ext},
         agent_output=result,
         action_description=f"Validation {'PASSED' if result['status'] == 'VALIDATED' else 'FAILED'}"
         )
-        logger.info(f" Agent action logged to database")
+        logger.info(" Agent action queued for audit log")
     except Exception as log_err:
-        logger.error(f"  Could not log validation action: {log_err}")
-    
-    db.close()
+        logger.error("  Could not log validation action: %s", log_err)
     
-    print(f"✅ Validator Agent: {result['status']}")
-    logger.info(f" Validation Agent Complete: {result['status']}\n")
+    logger.info(" Validation Agent Complete: %s\n", result['status'])
     return result
\ No newline at end of file
@@ -1,14 +1,62 @@
+import asyncio
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from .base import AgentState
 from .validation import validation_agent
 from .inference import inference_agent
-from .decision import decision_agent
+from .decision import decision_agent, warm_decision_model
 from .recommendation import recommendation_agent
 from utils.logger import setup_logger
 
 # Setup logger for workflow
 logger = setup_logger(f"Workflow_{__name__}")
 
+async def decide_and_recommend(state: AgentState) -> dict:
+    """
+    Runs the decision and recommendation agents as a single node.
+    
+    Once is_eligible is known the two LLM calls are independent, so for
+    ACCEPTED applicants both are awaited concurrently with asyncio.gather.
+    Set OLLAMA_NUM_PARALLEL=2 (or higher) on the Ollama server so the two
+    requests are actually served in parallel.
+    
+    Args:
+        state: Agent state with ML prediction and user data
+        
+    Returns:
+        Dictionary with decision fields and, if accepted, the recommendation
+    """
+    if not state.get('is_eligible', 0):
+        return await decision_agent(state)
+    
+    decision, recommendation = await asyncio.gather(
+        decision_agent(state),
+        recommendation_agent({**state, "status": "ACCEPTED"})
+    )
+    return {**decision, **recommendation}
+
+async def assess(state: AgentState) -> dict:
+    """
+    Runs ML inference, then the decision (and recommendation), as one node.
+    
+    The sklearn prediction runs in a worker thread while the decision model
+    is loaded into Ollama, so model load time is hidden behind inference.
+    
+    Args:
+        state: Validated agent state
+        
+    Returns:
+        Dictionary with ML prediction, decision and recommendation fields
+    """
+    loop = asyncio.get_running_loop()
+    inference, _ = await asyncio.gather(
+        loop.run_in_executor(None, inference_agent, state),
+        warm_decision_model()
+    )
+    decision = await decide_and_recommend({**state, **inference})
+    return {**inference, **decision}
+
+@lru_cache(maxsize=1)
 def build_workflow():
     """
     Compiles the LangGraph workflow for the multi-agent system.
@@ -16,38 +64,29 @@ def build_workflow():
     Flow:
     1. Validator → Checks document consistency
         ├─ If REJECTED → END
-        └─ If VALIDATED → Inferencer
-    
-    2. Inferencer → Runs ML model
-        └─ Decider
+        └─ If VALIDATED → Assessor
     
-    3. Decider → Makes final decision (ACCEPTED/SOFT DECLINE)
-        ├─ If ACCEPTED → Advisor (recommendations)
-        └─ If SOFT DECLINE → END
-    
-    4. Advisor → Suggests support pathway
+    2. Assessor → Runs ML model (while warming the LLM), then makes the
+       final decision (ACCEPTED/SOFT DECLINE)
+        ├─ If ACCEPTED → also suggests support pathway (concurrently)
         └─ END
     
+    The graph is compiled once per process; use the module-level
+    lang_agent rather than calling this per request.
+    
     Returns:
         Compiled workflow graph
     """
     logger.info(" Building LangGraph workflow...")
     builder = StateGraph(AgentState)
     
-    # Wrapper to merge agent outputs into state
-    def merge_state(agent_func):
-        def wrapper(state):
-            result = agent_func(state)
-            return {**state, **result}  # Merge result into state
-        return wrapper
-    
     logger.info(" Adding workflow nodes...")
 
     # ===== ADD NODES =====
-    builder.add_node("validator", merge_state(validation_agent))
-    builder.add_node("inferencer", merge_state(inference_agent))
-    builder.add_node("decider", merge_state(decision_agent))
-    builder.add_node("advisor", merge_state(recommendation_agent))
+    # Nodes return only the keys they change; LangGraph merges each
+    # update into the state, so no per-hop copy of the whole state
+    builder.add_node("validator", validation_agent)
+    builder.add_node("assessor", assess)
     
     # ===== SET ENTRY POINT =====
     builder.set_entry_point("validator")
@@ -55,40 +94,28 @@ def build_workflow():
     # ===== ADD CONDITIONAL EDGES =====
     logger.info(" Adding workflow edges...")
 
-    # After Validator: REJECTED → END, VALIDATED → Inferencer
+    # After Validator: REJECTED → END, VALIDATED → Assessor
     logger.debug(" Adding validator conditional edge")
     builder.add_conditional_edges(
         "validator",
         lambda x: "end" if x.get("status") == "REJECTED" else "continue",
         {
             "end": END,
-            "continue": "inferencer"
+            "continue": "assessor"
         }
     )
     
-    # After Inferencer: Always go to Decider
-    logger.debug(" Adding inferencer → decider edge")
-    builder.add_edge("inferencer", "decider")
-    
-    # After Decider: ACCEPTED → Advisor, SOFT DECLINE → END
-    logger.debug(" Adding decider conditional edge")
-    builder.add_conditional_edges(
-        "decider",
-        lambda x: "rec" if x.get("status") == "ACCEPTED" else "end",
-        {
-            "rec": "advisor",
-            "end": END
-        }
-    )
-    
-    # After Advisor: Always END
-    logger.debug(" Adding advisor → END edge")
-    builder.add_edge("advisor", END)
+    # After Assessor: Always END (decision and recommendation are produced in the same node)
+    logger.debug(" Adding assessor → END edge")
+    builder.add_edge("assessor", END)
     
     # ===== COMPILE AND RETURN =====
     logger.info(" Compiling workflow graph...")
     compiled_workflow = builder.compile()
     logger.info(" Workflow compiled successfully!")
-    print("✅ Workflow compiled successfully")
     
-    return compiled_workflow
\ No newline at end of file
+    return compiled_workflow
+
+
+# Compiled once at import and shared by every caller
+lang_agent = build_workflow()
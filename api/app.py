@@ -1,8 +1,82 @@
-from fastapi import FastAPI
+import asyncio
+import secrets
+import uuid
+import orjson
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .routes import router
+from agents import audit, build_workflow, start_warmup
+from agents.llm import response_cache
+from config import API_DEBUG, CORS_ORIGINS, METRICS_TOKEN
+from db_manager import warm_pool
+from utils.logger import setup_logger
+
+# Setup logger for the API
+logger = setup_logger(f"API_{__name__}")
+
+
+class OriginAwareCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware that passes requests without an Origin header straight
+    through (same-origin and server-to-server calls need no CORS headers).
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not any(k == b"origin" for k, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class ApiJSONResponse(ORJSONResponse):
+    """orjson responses that also accept NumPy values from the ML model."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile the agent workflow, warm the LLM and open the DB pool at startup; flush queued audit rows on shutdown."""
+    app.state.workflow = build_workflow()
+    start_warmup()
+    await warm_pool()
+    yield
+    await asyncio.to_thread(audit.flush)
+
+
+def _metrics_allowed(request: Request) -> bool:
+    """
+    Whether a client may read /metrics.
+    
+    With METRICS_TOKEN set, the request must carry it as a bearer token;
+    without one, only clients on the loopback interface are served.
+    """
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        return secrets.compare_digest(supplied.encode(), f"Bearer {METRICS_TOKEN}".encode())
+    return request.client is not None and request.client.host in ("127.0.0.1", "::1")
+
+
+async def general_exception_handler(request, exc):
+    """
+    Handle general exceptions.
+    
+    The traceback is logged under a short error ID that is returned to the
+    client; the exception text itself is only included when API_DEBUG is on.
+    """
+    error_id = uuid.uuid4().hex[:12]
+    logger.exception("Unhandled error %s on %s %s", error_id, request.method, request.url.path, exc_info=exc)
+    content = {
+        "error": "Internal Server Error",
+        "error_id": error_id
+    }
+    if API_DEBUG:
+        content["detail"] = str(exc)
+    return JSONResponse(status_code=500, content=content)
 
 
 def create_app() -> FastAPI:
@@ -18,13 +92,16 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
-        openapi_url="/openapi.json"
+        openapi_url="/openapi.json",
+        lifespan=lifespan,
+        default_response_class=ApiJSONResponse,
+        exception_handlers={Exception: general_exception_handler}
     )
     
     # ===== CORS CONFIGURATION =====
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # Change to specific domains in production
+        OriginAwareCORSMiddleware,
+        allow_origins=CORS_ORIGINS,  # set CORS_ORIGINS to specific domains in production
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -44,16 +121,14 @@ def create_app() -> FastAPI:
             "status": "running"
         }
     
-    # ===== EXCEPTION HANDLERS =====
-    @app.exception_handler(Exception)
-    async def general_exception_handler(request, exc):
-        """Handle general exceptions."""
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Internal Server Error",
-                "detail": str(exc)
-            }
-        )
+    # ===== METRICS ENDPOINT =====
+    @app.get("/metrics")
+    async def metrics(request: Request):
+        """LLM response cache statistics (entries, hits, misses, hit rate)."""
+        if not _metrics_allowed(request):
+            raise HTTPException(status_code=403, detail="Forbidden")
+        return {
+            "llm_cache": response_cache.stats()
+        }
     
     return app
\ No newline at end of file
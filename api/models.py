@@ -1,6 +1,10 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List
 from enum import Enum
+from datetime import datetime
+
+# Same shape check as utils.validators.validate_email, enforced by pydantic-core
+EMAIL_PATTERN = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
 
 
 class MaritalStatusEnum(str, Enum):
@@ -22,7 +26,7 @@ class ApplicationDataRequest(BaseModel):
     """Request model for application submission."""
     name: str = Field(..., min_length=1, max_length=255, description="Applicant name")
     emirates_id: str = Field(..., min_length=6, max_length=15, description="Emirates ID")
-    email: Optional[EmailStr] = None
+    email: Optional[str] = Field(default=None, max_length=254, pattern=EMAIL_PATTERN, description="Email address")
     age: int = Field(..., ge=18, le=100, description="Age")
     address: str = Field(..., min_length=5, description="Residential address")
     family_size: int = Field(default=1, ge=1, le=20, description="Family size")
@@ -30,8 +34,9 @@ class ApplicationDataRequest(BaseModel):
     marital_status: MaritalStatusEnum = Field(default=MaritalStatusEnum.SINGLE)
     employment_status: EmploymentStatusEnum = Field(default=EmploymentStatusEnum.UNEMPLOYED)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        json_schema_extra={
             "example": {
                 "name": "Lauren Trujillo",
                 "emirates_id": "634544",
@@ -44,6 +49,7 @@ class ApplicationDataRequest(BaseModel):
                 "employment_status": "Unemployed"
             }
         }
+    )
 
 
 class DocumentUploadRequest(BaseModel):
@@ -51,13 +57,74 @@ class DocumentUploadRequest(BaseModel):
     application_id: str = Field(..., description="Application ID")
     document_type: str = Field(..., description="Document type: ID, Bank, Credit, Medical, Resume, Assets")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        json_schema_extra={
             "example": {
                 "application_id": "550e8400-e29b-41d4-a716-446655440000",
                 "document_type": "ID"
             }
         }
+    )
+
+
+class SubmitApplicationResponse(BaseModel):
+    """Response model for application submission."""
+    application_id: str
+    status: str
+    message: str
+    next_step: str
+
+
+class DocumentUploadResponse(BaseModel):
+    """Response model for a processed document upload."""
+    application_id: str
+    document_type: str
+    is_valid: bool
+    processing_time: float
+    verification_result: str
+
+
+class ProcessQueuedResponse(BaseModel):
+    """Response model for an application queued for the agent workflow."""
+    application_id: str
+    status: str
+    poll: str
+
+
+class ApplicationResultResponse(BaseModel):
+    """Response model for the agent workflow result."""
+    application_id: str
+    status: str
+    final_decision: str = ""
+    is_eligible: int = 0
+    confidence: float = 0.0
+
+
+class ApplicationSummaryResponse(BaseModel):
+    """Response model for application details."""
+    application_id: str
+    applicant_name: str
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    logs_count: int = 0
+
+
+class ApplicationListItem(BaseModel):
+    """One application in a list response."""
+    application_id: str
+    applicant_name: str
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ApplicationListResponse(BaseModel):
+    """Response model for a page of applications."""
+    total: int
+    skip: int
+    limit: int
+    applications: List[ApplicationListItem]
+    next_cursor: Optional[str] = None
 
 
 class ExtractionResultResponse(BaseModel):
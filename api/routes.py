@@ -1,10 +1,20 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Request, Response, Depends, Query
 from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
 import uuid
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 from .models import (
     ApplicationDataRequest,
+    SubmitApplicationResponse,
+    DocumentUploadResponse,
+    ProcessQueuedResponse,
+    ApplicationResultResponse,
+    ApplicationSummaryResponse,
+    ApplicationListItem,
+    ApplicationListResponse,
     ApplicationResponseFull,
     ExtractionResultResponse,
     AgentDecisionResponse,
@@ -12,14 +22,48 @@ from .models import (
     ErrorResponse
 )
 from processors import ProcessorFactory
-from agents import build_workflow, AgentState
-from db_manager import DatabaseManager
+from agents import AgentState
+from db_manager import AsyncDatabaseManager, get_async_db
 from config import SUPPORTED_DOCUMENTS
 from utils import validate_emirates_id
+from utils.logger import setup_logger
+
+# Setup logger for the API routes
+logger = setup_logger(f"API_{__name__}")
 
 router = APIRouter(prefix="/api/v1", tags=["applications"])
 
 
+def _etag(*parts) -> str:
+    """Quoted ETag for a resource version built from the given values."""
+    return '"' + hashlib.md5(":".join(map(str, parts)).encode()).hexdigest() + '"'
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> bool:
+    """Set the ETag header and report whether the client already has this version."""
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+
+def _encode_cursor(row) -> str:
+    """Page cursor holding the (created_at, id) of a listed application."""
+    return f"{row.created_at.isoformat()},{row.id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Split a page cursor back into (created_at, id).
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    created_at, _, app_id = cursor.partition(",")
+    try:
+        return datetime.fromisoformat(created_at), app_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -37,13 +81,14 @@ async def health_check():
     }
 
 
-@router.post("/applications/submit", response_model=Dict)
-async def submit_application(request: ApplicationDataRequest):
+@router.post("/applications/submit", response_model=SubmitApplicationResponse)
+async def submit_application(request: ApplicationDataRequest, db: AsyncDatabaseManager = Depends(get_async_db)):
     """
     Submit a new application with demographics.
     
     Args:
         request: Application data
+        db: Database session for this request
         
     Returns:
         Application ID and submission confirmation
@@ -70,31 +115,29 @@ async def submit_application(request: ApplicationDataRequest):
     }
     
     # Save to database
-    db = DatabaseManager()
     try:
-        db.save_application(
+        await db.save_application(
             ui_data=ui_data,
             extracted_data={},
             validation_results={"status": "PENDING", "errors": []}
         )
-        db.close()
     except Exception as e:
-        db.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     
-    return {
-        "application_id": app_id,
-        "status": "submitted",
-        "message": f"Application submitted for {request.name}",
-        "next_step": "Upload documents"
-    }
+    return SubmitApplicationResponse(
+        application_id=app_id,
+        status="submitted",
+        message=f"Application submitted for {request.name}",
+        next_step="Upload documents"
+    )
 
 
-@router.post("/applications/{application_id}/upload-document")
+@router.post("/applications/{application_id}/upload-document", response_model=DocumentUploadResponse)
 async def upload_document(
     application_id: str,
     document_type: str,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    db: AsyncDatabaseManager = Depends(get_async_db)
 ):
     """
     Upload a document for an application.
@@ -103,6 +146,7 @@ async def upload_document(
         application_id: Application ID
         document_type: Type of document (ID, Bank, Credit, Medical, Resume, Assets)
         file: File to upload
+        db: Database session for this request
         
     Returns:
         Processing result
@@ -114,180 +158,255 @@ async def upload_document(
             detail=f"Invalid document type. Supported: {', '.join(SUPPORTED_DOCUMENTS.keys())}"
         )
     
-    # Read file
-    try:
-        file_bytes = await file.read()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
-    
     # Get application data from database
-    db = DatabaseManager()
     try:
-        app = db.session.query(db.Application).filter_by(id=application_id).first()
-        if not app:
-            raise HTTPException(status_code=404, detail=f"Application {application_id} not found")
-        
-        ui_data = app.extracted_data  # This should have ui_data stored
-        db.close()
+        app = await db.get_application(application_id)
     except Exception as e:
-        db.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    if not app:
+        raise HTTPException(status_code=404, detail=f"Application {application_id} not found")
+    
+    ui_data = app.extracted_data  # This should have ui_data stored
     
-    # Process document
+    # Process document straight from the upload's spooled temp file (large
+    # uploads live on disk, not in memory) in a worker thread
     try:
         processor = ProcessorFactory.create_processor(document_type, ui_data)
-        is_valid, df, processing_time = processor.process(file_bytes)
+        is_valid, df, processing_time = await asyncio.to_thread(processor.process, file.file)
         
-        return {
-            "application_id": application_id,
-            "document_type": SUPPORTED_DOCUMENTS[document_type],
-            "is_valid": is_valid,
-            "processing_time": processing_time,
-            "verification_result": processor.verification_result
-        }
+        return DocumentUploadResponse(
+            application_id=application_id,
+            document_type=SUPPORTED_DOCUMENTS[document_type],
+            is_valid=is_valid,
+            processing_time=processing_time,
+            verification_result=processor.verification_result
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
 
 
-@router.post("/applications/{application_id}/process")
-async def process_application(application_id: str, background_tasks: BackgroundTasks):
+async def _run_workflow(workflow, application_id: str, initial_state: AgentState):
+    """
+    Run the agent workflow after the response has been sent and record the
+    outcome in the audit log, where the result endpoint picks it up.
+    """
+    try:
+        final_output = await workflow.ainvoke(initial_state)
+        description = "Application processed via API"
+    except Exception as e:
+        logger.exception(" Workflow failed for %s", application_id)
+        final_output = {"status": "ERROR", "decision_reason": str(e)}
+        description = "Application processing failed via API"
+    
+    # The result endpoint polls for this row, so it is committed here rather
+    # than handed to the audit queue, which drops rows when full and loses
+    # them if the process exits before the writer flushes
+    db = AsyncDatabaseManager()
+    try:
+        saved = await db.log_agent_action(
+            app_id=application_id,
+            agent_name="api_processor",
+            agent_input={},
+            agent_output=final_output,
+            action_description=description
+        )
+    finally:
+        await db.close()
+    if not saved:
+        logger.error(" Could not record the workflow result for %s", application_id)
+
+
+@router.post("/applications/{application_id}/process", status_code=202, response_model=ProcessQueuedResponse)
+async def process_application(
+    application_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncDatabaseManager = Depends(get_async_db)
+):
     """
-    Process application through agent workflow.
+    Queue an application for processing through the agent workflow.
+    
+    The workflow (ML model and LLM calls) runs after the 202 response is
+    sent; poll the returned URL for the decision.
     
     Args:
         application_id: Application ID
+        request: Incoming request (gives access to the compiled workflow)
         background_tasks: Background task queue
+        db: Database session for this request
         
     Returns:
-        Processing status and results
+        Queued status and the result URL to poll
     """
     # Get application data
-    db = DatabaseManager()
     try:
-        app = db.session.query(db.Application).filter_by(id=application_id).first()
-        if not app:
-            db.close()
-            raise HTTPException(status_code=404, detail=f"Application {application_id} not found")
-        
-        ui_data = app.extracted_data
-        extracted_data = app.extracted_data
-        db.close()
+        app = await db.get_application(application_id)
     except Exception as e:
-        db.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    if not app:
+        raise HTTPException(status_code=404, detail=f"Application {application_id} not found")
     
-    # Run workflow
-    try:
-        workflow = build_workflow()
-        
-        initial_state: AgentState = {
-            "application_id": application_id,
-            "ui_data": ui_data,
-            "extracted_data": extracted_data,
-            "validation_errors": [],
-            "logs": [],
-            "is_eligible": 0,
-            "status": "PENDING",
-            "decision_reason": "",
-            "final_decision": "",
-            "recommendation": "",
-            "ml_prediction_confidence": 0.0
-        }
-        
-        final_output = workflow.invoke(initial_state)
-        
-        # Save results to database
-        db = DatabaseManager()
-        db.log_agent_action(
-            app_id=application_id,
-            agent_name="api_processor",
-            agent_input={},
-            agent_output=final_output,
-            action_description="Application processed via API"
-        )
-        db.close()
-        
-        return {
-            "application_id": application_id,
-            "status": final_output.get('status', 'UNKNOWN'),
-            "final_decision": final_output.get('final_decision', ''),
-            "is_eligible": final_output.get('is_eligible', 0),
-            "confidence": final_output.get('ml_prediction_confidence', 0.0)
-        }
+    ui_data = app.extracted_data
+    extracted_data = app.extracted_data
+    
+    initial_state: AgentState = {
+        "application_id": application_id,
+        "ui_data": ui_data,
+        "extracted_data": extracted_data,
+        "validation_errors": [],
+        "logs": [],
+        "is_eligible": 0,
+        "status": "PENDING",
+        "decision_reason": "",
+        "final_decision": "",
+        "recommendation": "",
+        "ml_prediction_confidence": 0.0
+    }
+    
+    # Run workflow once the response is sent
+    background_tasks.add_task(_run_workflow, request.app.state.workflow, application_id, initial_state)
+    
+    return ProcessQueuedResponse(
+        application_id=application_id,
+        status="queued",
+        # Path as routed, including the router's /api/v1 prefix
+        poll=str(request.app.url_path_for("get_application_result", application_id=application_id))
+    )
+
+
+@router.get("/applications/{application_id}/result", response_model=ApplicationResultResponse)
+async def get_application_result(
+    application_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncDatabaseManager = Depends(get_async_db)
+):
+    """
+    Get the workflow decision for a processed application.
+    
+    The decision never changes once written, so repeat polls with
+    If-None-Match get 304 Not Modified.
+    
+    Args:
+        application_id: Application ID
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for the ETag header)
+        db: Database session for this request
         
+    Returns:
+        Decision fields, or status "processing" while the workflow runs
+    """
+    try:
+        log = await db.get_latest_agent_log(application_id, "api_processor")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Workflow error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    if not log:
+        return ApplicationResultResponse(application_id=application_id, status="processing")
+    
+    if _not_modified(request, response, _etag(log.id)):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+    
+    final_output = log.agent_output or {}
+    return ApplicationResultResponse(
+        application_id=application_id,
+        status=final_output.get('status', 'UNKNOWN'),
+        final_decision=final_output.get('final_decision', ''),
+        is_eligible=final_output.get('is_eligible', 0),
+        confidence=final_output.get('ml_prediction_confidence', 0.0)
+    )
 
 
-@router.get("/applications/{application_id}")
-async def get_application(application_id: str):
+@router.get("/applications/{application_id}", response_model=ApplicationSummaryResponse)
+async def get_application(
+    application_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncDatabaseManager = Depends(get_async_db)
+):
     """
     Get application details.
     
     Args:
         application_id: Application ID
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for the ETag header)
+        db: Database session for this request
         
     Returns:
         Application data and results
     """
-    db = DatabaseManager()
     try:
-        app = db.session.query(db.Application).filter_by(id=application_id).first()
+        # Application and its audit log count in a single round-trip
+        app, logs_count = await db.get_application_with_log_count(application_id)
         if not app:
-            db.close()
             raise HTTPException(status_code=404, detail=f"Application {application_id} not found")
         
-        # Get audit logs
-        logs = db.session.query(db.AuditLog).filter_by(application_id=application_id).all()
-        
-        db.close()
+        if _not_modified(request, response, _etag(app.id, app.updated_at, logs_count)):
+            return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
         
-        return {
-            "application_id": app.id,
-            "applicant_name": app.applicant_name,
-            "status": app.validation_status,
-            "created_at": app.created_at.isoformat() if app.created_at else None,
-            "logs_count": len(logs)
-        }
+        return ApplicationSummaryResponse(
+            application_id=app.id,
+            applicant_name=app.applicant_name,
+            status=app.validation_status,
+            created_at=app.created_at,
+            logs_count=logs_count
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        db.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-@router.get("/applications")
-async def list_applications(skip: int = 0, limit: int = 10):
+@router.get("/applications", response_model=ApplicationListResponse)
+async def list_applications(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncDatabaseManager = Depends(get_async_db)
+):
     """
     List all applications.
     
+    A cheap MAX(updated_at)/COUNT query versions the table, so an
+    unchanged page is answered with 304 without loading its rows.
+    
     Args:
-        skip: Number of records to skip
-        limit: Maximum records to return
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for the ETag header)
+        skip: Number of records to skip (ignored when cursor is given)
+        limit: Maximum records to return (1-100)
+        cursor: next_cursor from the previous page, for keyset pagination
+        db: Database session for this request
         
     Returns:
-        List of applications
+        Page of applications, the total count and the cursor for the next page
     """
-    db = DatabaseManager()
     try:
-        apps = db.session.query(db.Application).offset(skip).limit(limit).all()
-        db.close()
+        last_updated, count = await db.get_applications_version()
+        if _not_modified(request, response, _etag(last_updated, count, skip, limit, cursor)):
+            return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+        
+        apps = await db.list_applications(skip, limit, _decode_cursor(cursor) if cursor else None)
         
-        return {
-            "total": len(apps),
-            "skip": skip,
-            "limit": limit,
-            "applications": [
-                {
-                    "application_id": app.id,
-                    "applicant_name": app.applicant_name,
-                    "status": app.validation_status,
-                    "created_at": app.created_at.isoformat() if app.created_at else None
-                }
+        return ApplicationListResponse(
+            total=count,
+            skip=skip,
+            limit=limit,
+            next_cursor=_encode_cursor(apps[-1]) if apps and len(apps) == limit else None,
+            applications=[
+                ApplicationListItem(
+                    application_id=app.id,
+                    applicant_name=app.applicant_name,
+                    status=app.validation_status,
+                    created_at=app.created_at
+                )
                 for app in apps
             ]
-        }
+        )
+    except HTTPException:
+        raise
     except Exception as e:
-        db.close()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
\ No newline at end of file
@@ -3,15 +3,19 @@ os.environ["LANGCHAIN_TRACING_V2"] = "false"
 os.environ["LANGCHAIN_PROJECT"] = "sovereign-ai-verifier"
 
 import uvicorn
-from api import create_app
+from config import API_WORKERS, API_RELOAD
 
 if __name__ == "__main__":
-    app = create_app()
-    
+    # Workers and reload need an import string; each worker builds its own app.
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard]).
     uvicorn.run(
-        app,
+        "api:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=API_RELOAD,
+        workers=1 if API_RELOAD else API_WORKERS,
+        loop="auto",
+        http="auto",
         log_level="info"
-    )
\ No newline at end of file
+    )
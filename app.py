@@ -1,15 +1,16 @@
 import streamlit as st
 import pandas as pd
-import ollama
 import uuid
 from datetime import datetime
+from functools import lru_cache
 
 # ===== IMPORTS: Modular Structure =====
 from processors import ProcessorFactory
-from agents import build_workflow, AgentState
-from db_manager import DatabaseManager
+from agents import build_workflow, AgentState, start_warmup
+from agents.llm import client as llm_client, run_sync, CONTEXT_OPTIONS
+from db_manager import db_session
 from models import init_db
-from config import SUPPORTED_DOCUMENTS, OLLAMA_MODEL
+from config import SUPPORTED_DOCUMENTS, OLLAMA_MODEL, OLLAMA_KEEP_ALIVE
 from utils import validate_emirates_id, validate_email
 
 # ===== INITIALIZE DATABASE =====
@@ -18,6 +19,48 @@ try:
 except:
     pass  # Tables already exist
 
+# ===== AGENT WORKFLOW =====
+@st.cache_resource
+def get_workflow():
+    """Compiled agent workflow, shared by every session and rerun."""
+    return build_workflow()
+
+@st.cache_resource
+def warm_llm():
+    """Start the Ollama warm-up once per server process, not on every rerun."""
+    return start_warmup()
+
+warm_llm()
+
+_CHAT_PROMPT_TEMPLATE = """
+            You are a Sovereign AI Assistant.
+            
+            APPLICANT: {applicant_name}
+            STATUS: {status}
+            GREETING: {greeting}
+            REASON: {reason}
+            RECOMMENDATION: {recommendation}
+
+            STRICT CONVERSATION PROTOCOL:
+            1. If the applicant was REJECTED, you have already said the Greeting.
+            2. ONLY if the user asks "Why?", "Reason?", or "What is the issue?", provide the 'REASON'.
+            3. Use document names and values EXACTLY as they appear in the REASON.
+            4. If the user asks about support or what they get, provide the 'RECOMMENDATION'.
+            5. NEVER show code, Python, or raw data structures.
+            6. Keep responses under 3 lines.
+            """
+
+@lru_cache(maxsize=8)
+def chat_system_prompt(applicant_name, status, greeting, reason, recommendation):
+    """Assistant system prompt for one decision (only changes when the result does)."""
+    return _CHAT_PROMPT_TEMPLATE.format_map({
+        "applicant_name": applicant_name,
+        "status": status,
+        "greeting": greeting,
+        "reason": reason,
+        "recommendation": recommendation
+    })
+
 # ===== STREAMLIT CONFIG =====
 st.set_page_config(page_title="Sovereign AI Verifier", layout="wide")
 
@@ -111,14 +154,13 @@ with col_form:
         # ===== PROCESS DOCUMENTS USING FACTORY =====
         with st.spinner("Processing documents..."):
             try:
-                # Use factory to batch process documents
-                results = ProcessorFactory.process_documents(
-                    {doc_type: files[doc_type].getvalue() for doc_type in files},
-                    ui_data
-                )
+                # Use factory to batch process documents; the uploaded files
+                # are read in place rather than copied out with getvalue()
+                results = ProcessorFactory.process_documents(files, ui_data)
                 
                 # Extract results and build history
                 extracted_data_dict = {}
+                extraction_rows = []
                 
                 for doc_type, result in results.items():
                     doc_label = SUPPORTED_DOCUMENTS[doc_type]
@@ -126,7 +168,7 @@ with col_form:
                     # Store in extraction history for UI display
                     st.session_state.extraction_history.append({
                         "label": doc_label,
-                        "df": result["dataframe"],
+                        "rows": result["rows"],
                         "ok": result["is_valid"]
                     })
                     
@@ -138,16 +180,17 @@ with col_form:
                     if not result["is_valid"]:
                         validation_errors.append(f"Validation Mismatch in {doc_label}")
                     
-                    # Log to database
-                    db = DatabaseManager()
-                    db.save_document_extraction(
-                        app_id=app_id,
-                        document_type=doc_label,
-                        extracted_content=result["verification_result"],
-                        status="SUCCESS" if result["is_valid"] else "FAILED",
-                        errors=result["error"]
-                    )
-                    db.close()
+                    extraction_rows.append({
+                        "app_id": app_id,
+                        "document_type": doc_label,
+                        "extracted_content": result["verification_result"],
+                        "status": "SUCCESS" if result["is_valid"] else "FAILED",
+                        "errors": result["error"]
+                    })
+                
+                # Log every document to the database in one commit
+                with db_session() as db:
+                    db.save_document_extractions(extraction_rows)
                 
                 # Stop if validation failed
                 if validation_errors:
@@ -160,23 +203,20 @@ with col_form:
                 st.stop()
         
         # ===== SAVE APPLICATION TO DATABASE =====
-        db = DatabaseManager()
-        db.save_application(
-            ui_data=ui_data,
-            extracted_data=extracted_data_dict,
-            validation_results={
-                "status": "VALIDATED",
-                "errors": validation_errors
-            }
-        )
-        db.close()
+        with db_session() as db:
+            db.save_application(
+                ui_data=ui_data,
+                extracted_data=extracted_data_dict,
+                validation_results={
+                    "status": "VALIDATED",
+                    "errors": validation_errors
+                }
+            )
         
         # ===== RUN AGENT WORKFLOW =====
         with st.spinner("Running verification agents..."):
             try:
-                # Build and invoke workflow
-                lang_agent = build_workflow()
-                
+                # Invoke the shared compiled workflow
                 initial_state: AgentState = {
                     "application_id": app_id,
                     "ui_data": ui_data,
@@ -191,7 +231,7 @@ with col_form:
                     "ml_prediction_confidence": 0.0
                 }
                 
-                final_output = lang_agent.invoke(initial_state)
+                final_output = run_sync(get_workflow().ainvoke(initial_state))
                 st.session_state.agent_result = final_output
                 
             except Exception as e:
@@ -215,7 +255,7 @@ with col_form:
         
         for item in st.session_state.extraction_history:
             with st.expander(f"📊 Extraction: {item['label']}", expanded=True):
-                st.dataframe(item['df'], use_container_width=True, hide_index=True)
+                st.dataframe(item['rows'], use_container_width=True, hide_index=True)
         
         # Display Application ID
         if st.session_state.application_id:
@@ -241,33 +281,30 @@ with col_chat:
             res = st.session_state.agent_result
             applicant_name = st.session_state.ui_data.get('name', 'Applicant')
             
-            # Build dynamic system prompt
-            sys_msg = f"""
-            You are a Sovereign AI Assistant.
-            
-            APPLICANT: {applicant_name}
-            STATUS: {res.get('status', 'Unknown')}
-            GREETING: {res.get('final_decision', '')}
-            REASON: {res.get('decision_reason', '')}
-            RECOMMENDATION: {res.get('recommendation', 'N/A')}
-
-            STRICT CONVERSATION PROTOCOL:
-            1. If the applicant was REJECTED, you have already said the Greeting.
-            2. ONLY if the user asks "Why?", "Reason?", or "What is the issue?", provide the 'REASON'.
-            3. Use document names and values EXACTLY as they appear in the REASON.
-            4. If the user asks about support or what they get, provide the 'RECOMMENDATION'.
-            5. NEVER show code, Python, or raw data structures.
-            6. Keep responses under 3 lines.
-            """
+            # System prompt for this decision (cached across chat turns)
+            sys_msg = chat_system_prompt(
+                applicant_name,
+                res.get('status', 'Unknown'),
+                res.get('final_decision', ''),
+                res.get('decision_reason', ''),
+                res.get('recommendation', 'N/A')
+            )
             
             # Build message list
             msgs = [{"role": "system", "content": sys_msg}] + st.session_state.messages
             
+            # Stream tokens to the page as they are generated
             try:
-                resp = ollama.chat(model=OLLAMA_MODEL, messages=msgs)
-                ans = resp['message']['content'].strip()
+                stream = llm_client.chat(
+                    model=OLLAMA_MODEL,
+                    messages=msgs,
+                    stream=True,
+                    options=CONTEXT_OPTIONS,
+                    keep_alive=OLLAMA_KEEP_ALIVE
+                )
+                ans = st.write_stream(chunk['message']['content'] for chunk in stream).strip()
             except Exception as e:
                 ans = f"Sorry, I encountered an error: {e}"
+                st.markdown(ans)
             
-            st.markdown(ans)
             st.session_state.messages.append({"role": "assistant", "content": ans})
\ No newline at end of file
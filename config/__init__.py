@@ -1,19 +1,55 @@
 from .settings import (
     DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
     OLLAMA_MODEL,
     OLLAMA_HOST,
+    OLLAMA_TIMEOUT,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_NUM_CTX,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
     ML_MODEL_PATH,
+    ML_PREDICT_THREADS,
+    ML_NEED_CONFIDENCE,
     INCOME_THRESHOLD,
     SUPPORTED_DOCUMENTS,
-    LOG_LEVEL
+    PDF_BACKEND,
+    PDF_TEXT_CACHE_DIR,
+    PDF_TEXT_CACHE_ENTRIES,
+    LOG_LEVEL,
+    API_DEBUG,
+    METRICS_TOKEN,
+    API_WORKERS,
+    API_RELOAD,
+    CORS_ORIGINS
 )
 
 __all__ = [
     "DATABASE_URL",
+    "DB_POOL_SIZE",
+    "DB_MAX_OVERFLOW",
+    "DB_POOL_TIMEOUT",
     "OLLAMA_MODEL",
     "OLLAMA_HOST",
+    "OLLAMA_TIMEOUT",
+    "OLLAMA_KEEP_ALIVE",
+    "OLLAMA_NUM_CTX",
+    "LLM_CACHE_MAX_ENTRIES",
+    "LLM_CACHE_TTL_SECONDS",
     "ML_MODEL_PATH",
+    "ML_PREDICT_THREADS",
+    "ML_NEED_CONFIDENCE",
     "INCOME_THRESHOLD",
     "SUPPORTED_DOCUMENTS",
-    "LOG_LEVEL"
+    "PDF_BACKEND",
+    "PDF_TEXT_CACHE_DIR",
+    "PDF_TEXT_CACHE_ENTRIES",
+    "LOG_LEVEL",
+    "API_DEBUG",
+    "METRICS_TOKEN",
+    "API_WORKERS",
+    "API_RELOAD",
+    "CORS_ORIGINS"
 ]
\ No newline at end of file
@@ -1,18 +1,30 @@
+import logging
 import os
 from dotenv import load_dotenv
+from sqlalchemy import make_url
 
 load_dotenv()
 
 # ===== LLM Configuration =====
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:1b")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "60"))  # seconds
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "60m")  # how long Ollama keeps the model loaded
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "2048"))  # context window; same for every call to avoid reloads
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
 
 # ===== ML Model Configuration =====
 ML_MODEL_PATH = os.getenv("ML_MODEL_PATH", "best_eligibility_model.pkl")
 INCOME_THRESHOLD = float(os.getenv("INCOME_THRESHOLD", "500"))  # AED
+ML_PREDICT_THREADS = int(os.getenv("ML_PREDICT_THREADS", "1"))  # single-row predict is fastest on one thread
+ML_NEED_CONFIDENCE = os.getenv("ML_NEED_CONFIDENCE", "true").lower() == "true"  # compute predict_proba confidence
 
 # ===== Database Configuration =====
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sovereign_ai.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))  # connections kept open per engine
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # extra connections allowed under burst
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
 
 # ===== Document Types =====
 SUPPORTED_DOCUMENTS = {
@@ -23,9 +35,17 @@ SUPPORTED_DOCUMENTS = {
     "Resume": "Resume",
     "Assets": "Assets/Liabilities"
 }
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfium").lower()  # pdfium (used when installed) or pypdf
+PDF_TEXT_CACHE_DIR = os.getenv("PDF_TEXT_CACHE_DIR", ".cache/pdf_text")  # extracted text keyed by file hash; empty disables
+PDF_TEXT_CACHE_ENTRIES = int(os.getenv("PDF_TEXT_CACHE_ENTRIES", "64"))  # texts also kept in memory; 0 disables
 
 # ===== Logging Configuration =====
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]  # comma-separated allow-list
+API_WORKERS = int(os.getenv("API_WORKERS", str(os.cpu_count() or 1)))  # uvicorn worker processes
+API_RELOAD = os.getenv("API_RELOAD", "false").lower() == "true"  # dev auto-reload (single worker)
+API_DEBUG = os.getenv("API_DEBUG", "false").lower() == "true"  # include exception text in API error responses
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # bearer token for /metrics; empty allows local clients only
 
 # ===== Validation Rules =====
 MAX_FAMILY_SIZE = 20
@@ -39,7 +59,11 @@ ACCEPTED_STATUS = "ACCEPTED"
 SOFT_DECLINE_STATUS = "SOFT DECLINE"
 REJECTED_STATUS = "REJECTED"
 
-print(f"✅ Configuration loaded from .env file")
-print(f"   Database: {DATABASE_URL}")
-print(f"   LLM Model: {OLLAMA_MODEL}")
-print(f"   ML Model: {ML_MODEL_PATH}")
\ No newline at end of file
+# Plain module logger: importing config adds no handlers and creates no log
+# files; the line appears only where the application has configured logging.
+# The database password is masked
+logger = logging.getLogger(__name__)
+logger.info(
+    " Configuration loaded: database=%s, llm=%s, ml_model=%s",
+    make_url(DATABASE_URL).render_as_string(hide_password=True), OLLAMA_MODEL, ML_MODEL_PATH
+)
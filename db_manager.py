@@ -1,7 +1,29 @@
-from models import SessionLocal, Application, DocumentExtraction, AuditLog
+import asyncio
+from config import DB_POOL_SIZE
+from models import SessionLocal, AsyncSessionLocal, async_engine, Application, DocumentExtraction, AuditLog
+from sqlalchemy import func, insert, select, text, tuple_
+from sqlalchemy.orm import aliased
+from contextlib import contextmanager
 from datetime import datetime
 import json
 
+
+def _to_int(value):
+    """int(value), or None if missing or not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    """float(value), or None if missing or not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class DatabaseManager:
     """Handle all database operations."""
     
@@ -10,21 +32,26 @@ class DatabaseManager:
     
     # --- APPLICATION OPERATIONS ---
     
+    @staticmethod
+    def _build_application(ui_data, extracted_data, validation_results):
+        """Build an Application row from form data and extraction results."""
+        return Application(
+            applicant_name=ui_data.get('name'),
+            applicant_email=ui_data.get('email', ''),
+            age=ui_data.get('age'),
+            marital_status=ui_data.get('marital_status'),
+            family_size=ui_data.get('family_size'),
+            dependents=ui_data.get('dependents'),
+            employment_status=ui_data.get('employment_status'),
+            extracted_data=extracted_data,
+            validation_status=validation_results.get('status'),
+            validation_errors=validation_results.get('errors', [])
+        )
+    
     def save_application(self, ui_data, extracted_data, validation_results):
         """Save initial application with extracted data."""
         try:
-            app = Application(
-                applicant_name=ui_data.get('name'),
-                applicant_email=ui_data.get('email', ''),
-                age=ui_data.get('age'),
-                marital_status=ui_data.get('marital_status'),
-                family_size=ui_data.get('family_size'),
-                dependents=ui_data.get('dependents'),
-                employment_status=ui_data.get('employment_status'),
-                extracted_data=extracted_data,
-                validation_status=validation_results.get('status'),
-                validation_errors=validation_results.get('errors', [])
-            )
+            app = self._build_application(ui_data, extracted_data, validation_results)
             self.db.add(app)
             self.db.commit()
             self.db.refresh(app)
@@ -34,7 +61,30 @@ class DatabaseManager:
             self.db.rollback()
             print(f"❌ Error saving application: {e}")
             return None
-    
+
+    def save_applications(self, entries):
+        """Save a batch of applications in a single commit.
+
+        Each entry is a dict with the keyword arguments of save_application.
+        The rows are inserted together (one multi-row INSERT ... RETURNING
+        where the driver supports it) instead of one round trip per row.
+
+        Returns:
+            List of new application IDs, in entry order ([] on failure)
+        """
+        try:
+            apps = [self._build_application(**entry) for entry in entries]
+            self.db.add_all(apps)
+            self.db.flush()
+            app_ids = [app.id for app in apps]
+            self.db.commit()
+            print(f"✅ Saved {len(app_ids)} application(s)")
+            return app_ids
+        except Exception as e:
+            self.db.rollback()
+            print(f"❌ Error saving applications: {e}")
+            return []
+
     def get_application(self, app_id):
         """Retrieve application by ID."""
         try:
@@ -59,56 +109,108 @@ class DatabaseManager:
     
     # --- DOCUMENT EXTRACTION LOGS ---
     
+    @staticmethod
+    def _extraction_values(app_id, document_type, extracted_content, status="SUCCESS", errors=None):
+        """Column values of a DocumentExtraction row for a processor result."""
+        return dict(
+            application_id=app_id,
+            document_type=document_type,
+            extracted_content=extracted_content if isinstance(extracted_content, dict) else {"raw": str(extracted_content)},
+            extraction_status=status,
+            extraction_errors=errors or ""
+        )
+    
+    @classmethod
+    def _build_extraction(cls, *args, **kwargs):
+        """Build a DocumentExtraction row from a processor result."""
+        return DocumentExtraction(**cls._extraction_values(*args, **kwargs))
+    
     def save_document_extraction(self, app_id, document_type, extracted_content, status="SUCCESS", errors=None):
         """Log document extraction details."""
         try:
-            doc_log = DocumentExtraction(
-                application_id=app_id,
-                document_type=document_type,
-                extracted_content=extracted_content if isinstance(extracted_content, dict) else {"raw": str(extracted_content)},
-                extraction_status=status,
-                extraction_errors=errors or ""
-            )
-            self.db.add(doc_log)
+            self.db.add(self._build_extraction(app_id, document_type, extracted_content, status, errors))
             self.db.commit()
             print(f"✅ Document extraction logged for {document_type}")
         except Exception as e:
             self.db.rollback()
             print(f"❌ Error saving document extraction: {e}")
     
+    def save_document_extractions(self, entries):
+        """Log a batch of document extractions in a single commit.
+        
+        Each entry is a dict with the keyword arguments of save_document_extraction.
+        Rows go in as one bulk INSERT of plain values; no ORM objects are
+        built or tracked.
+        """
+        try:
+            if entries:
+                self.db.execute(insert(DocumentExtraction), [self._extraction_values(**entry) for entry in entries])
+            self.db.commit()
+            print(f"✅ Logged {len(entries)} document extraction(s)")
+        except Exception as e:
+            self.db.rollback()
+            print(f"❌ Error saving document extractions: {e}")
+    
     # --- AUDIT LOGS (Single Source of Truth) ---
     
+    @staticmethod
+    def _audit_values(app_id, agent_name, agent_input, agent_output, action_description):
+        """Column values of an AuditLog row for an agent action."""
+        # Convert to JSON-serializable format if needed
+        if not isinstance(agent_input, dict):
+            agent_input = {"raw": str(agent_input)}
+        if not isinstance(agent_output, dict):
+            agent_output = {"raw": str(agent_output)}
+        
+        # Extract decision fields from agent_output for easy querying
+        out = agent_output
+        confidence = out.get('ml_prediction_confidence')
+        return dict(
+            application_id=app_id,
+            agent_name=agent_name,
+            agent_action=action_description,
+            agent_input=agent_input,
+            agent_output=out,
+            # Extract decision fields if present in agent_output
+            decision_status=out.get('status') or out.get('decision_status'),
+            decision_reason=out.get('decision_reason', ''),
+            final_decision=out.get('final_decision', ''),
+            recommendation=out.get('recommendation', ''),
+            is_eligible=_to_int(out.get('is_eligible')),
+            ml_prediction_confidence=_to_float(confidence) if confidence else None
+        )
+    
+    @classmethod
+    def _build_audit(cls, *args, **kwargs):
+        """Build an AuditLog row from an agent action."""
+        return AuditLog(**cls._audit_values(*args, **kwargs))
+    
     def log_agent_action(self, app_id, agent_name, agent_input, agent_output, action_description):
         """Log each agent's action for compliance - SINGLE SOURCE OF TRUTH."""
         try:
-            # Convert to JSON-serializable format if needed
-            if not isinstance(agent_input, dict):
-                agent_input = {"raw": str(agent_input)}
-            if not isinstance(agent_output, dict):
-                agent_output = {"raw": str(agent_output)}
-            
-            # Extract decision fields from agent_output for easy querying
-            audit = AuditLog(
-                application_id=app_id,
-                agent_name=agent_name,
-                agent_action=action_description,
-                agent_input=agent_input,
-                agent_output=agent_output,
-                # Extract decision fields if present in agent_output
-                decision_status=agent_output.get('status') or agent_output.get('decision_status'),
-                decision_reason=agent_output.get('decision_reason', ''),
-                final_decision=agent_output.get('final_decision', ''),
-                recommendation=agent_output.get('recommendation', ''),
-                is_eligible=int(agent_output.get('is_eligible', 0)) if agent_output.get('is_eligible') is not None else None,
-                ml_prediction_confidence=float(agent_output.get('ml_prediction_confidence', 0.0)) if agent_output.get('ml_prediction_confidence') else None
-            )
-            self.db.add(audit)
+            self.db.add(self._build_audit(app_id, agent_name, agent_input, agent_output, action_description))
             self.db.commit()
             print(f"✅ Logged {agent_name} action for app {app_id}")
         except Exception as e:
             self.db.rollback()
             print(f"❌ Error logging agent action: {e}")
     
+    def log_agent_actions(self, entries):
+        """Log a batch of agent actions in a single commit.
+        
+        Each entry is a dict with the keyword arguments of log_agent_action.
+        Rows go in as one bulk INSERT of plain values; no ORM objects are
+        built or tracked.
+        """
+        try:
+            if entries:
+                self.db.execute(insert(AuditLog), [self._audit_values(**entry) for entry in entries])
+            self.db.commit()
+            print(f"✅ Logged {len(entries)} agent action(s)")
+        except Exception as e:
+            self.db.rollback()
+            print(f"❌ Error logging agent actions: {e}")
+    
     def get_audit_trail(self, app_id):
         """Retrieve full audit trail for an application."""
         try:
@@ -123,21 +225,28 @@ class DatabaseManager:
     def get_decision_summary(self, app_id):
         """Get final decision summary from audit logs."""
         try:
-            # Get the decider agent's decision (final status)
-            decision_log = self.db.query(AuditLog).filter(
+            # One query for both agents: rank each agent's rows newest first
+            # and keep rank 1, the latest decider decision / advisor recommendation
+            ranked = select(
+                AuditLog,
+                func.row_number().over(
+                    partition_by=AuditLog.agent_name,
+                    order_by=AuditLog.timestamp.desc()
+                ).label('rn')
+            ).where(
                 AuditLog.application_id == app_id,
-                AuditLog.agent_name == "decider"
-            ).order_by(AuditLog.timestamp.desc()).first()
+                AuditLog.agent_name.in_(["decider", "advisor"])
+            ).subquery()
+            latest_log = aliased(AuditLog, ranked)
+            logs = self.db.execute(
+                select(latest_log).where(ranked.c.rn == 1)
+            ).scalars().all()
             
-            # Get the advisor agent's recommendation (if accepted)
-            recommendation_log = self.db.query(AuditLog).filter(
-                AuditLog.application_id == app_id,
-                AuditLog.agent_name == "advisor"
-            ).order_by(AuditLog.timestamp.desc()).first()
+            latest = {log.agent_name: log for log in logs}
             
             return {
-                "decision": decision_log,
-                "recommendation": recommendation_log
+                "decision": latest.get("decider"),
+                "recommendation": latest.get("advisor")
             }
         except Exception as e:
             print(f"❌ Error retrieving decision summary: {e}")
@@ -145,4 +254,140 @@ class DatabaseManager:
     
     def close(self):
         """Close database session."""
-        self.db.close()
\ No newline at end of file
+        self.db.close()
+
+
+class AsyncDatabaseManager:
+    """Async database operations for the API (runs on the event loop)."""
+    
+    def __init__(self):
+        self.db = AsyncSessionLocal()
+    
+    async def save_application(self, ui_data, extracted_data, validation_results):
+        """Save initial application with extracted data."""
+        try:
+            app = DatabaseManager._build_application(ui_data, extracted_data, validation_results)
+            self.db.add(app)
+            await self.db.commit()
+            return app.id
+        except Exception as e:
+            await self.db.rollback()
+            print(f"❌ Error saving application: {e}")
+            return None
+    
+    async def log_agent_action(self, app_id, agent_name, agent_input, agent_output, action_description):
+        """Log an agent action and commit it before returning."""
+        try:
+            self.db.add(DatabaseManager._build_audit(app_id, agent_name, agent_input, agent_output, action_description))
+            await self.db.commit()
+            return True
+        except Exception as e:
+            await self.db.rollback()
+            print(f"❌ Error logging agent action: {e}")
+            return False
+    
+    async def get_application(self, app_id):
+        """Retrieve application by ID."""
+        result = await self.db.execute(select(Application).where(Application.id == app_id))
+        return result.scalar_one_or_none()
+    
+    async def get_application_with_log_count(self, app_id):
+        """Retrieve an application and its audit log count in one query.
+        
+        Returns:
+            (application, log_count), or (None, 0) if not found
+        """
+        result = await self.db.execute(
+            select(Application, func.count(AuditLog.id))
+            .outerjoin(AuditLog, AuditLog.application_id == Application.id)
+            .where(Application.id == app_id)
+            .group_by(Application.id)
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else (None, 0)
+    
+    async def get_applications_version(self):
+        """Latest update time and row count of the applications table (for ETags)."""
+        result = await self.db.execute(select(func.max(Application.updated_at), func.count(Application.id)))
+        return tuple(result.one())
+    
+    async def list_applications(self, skip=0, limit=10, cursor=None):
+        """Retrieve a page of application summaries in submission order.
+        
+        Rows are ordered by (created_at, id); the ID breaks ties between
+        applications created in the same instant. With a cursor (the
+        (created_at, id) of the last row of the previous page) the page is
+        found by keyset on ix_applications_created_id instead of skipping
+        rows, so deep pages cost the same as the first.
+        
+        Returns:
+            Rows with id, applicant_name, validation_status and created_at
+        """
+        query = select(
+            Application.id,
+            Application.applicant_name,
+            Application.validation_status,
+            Application.created_at
+        ).order_by(Application.created_at, Application.id).limit(limit)
+        if cursor is not None:
+            query = query.where(tuple_(Application.created_at, Application.id) > tuple_(*cursor))
+        else:
+            query = query.offset(skip)
+        result = await self.db.execute(query)
+        return result.all()
+    
+    async def get_audit_trail(self, app_id):
+        """Retrieve full audit trail for an application."""
+        result = await self.db.execute(
+            select(AuditLog).where(AuditLog.application_id == app_id).order_by(AuditLog.timestamp)
+        )
+        return result.scalars().all()
+    
+    async def get_latest_agent_log(self, app_id, agent_name):
+        """Retrieve the most recent audit log written by one agent."""
+        result = await self.db.execute(
+            select(AuditLog)
+            .where(AuditLog.application_id == app_id, AuditLog.agent_name == agent_name)
+            .order_by(AuditLog.timestamp.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+    
+    async def close(self):
+        """Close database session."""
+        await self.db.close()
+
+
+async def warm_pool():
+    """Open the async pool's connections at startup so early requests do not pay for them."""
+    async def _ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    await asyncio.gather(*(_ping() for _ in range(DB_POOL_SIZE)))
+
+
+@contextmanager
+def db_session():
+    """
+    Yield a DatabaseManager whose session is returned to the engine's
+    connection pool on exit.
+
+    Example:
+        with db_session() as db:
+            db.save_application(ui_data, extracted_data, validation_results)
+    """
+    db = DatabaseManager()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """FastAPI dependency providing an AsyncDatabaseManager for one request."""
+    db = AsyncDatabaseManager()
+    try:
+        yield db
+    finally:
+        await db.close()
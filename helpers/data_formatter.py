@@ -18,11 +18,12 @@ def format_extraction_results(extraction_dict: Dict[str, str]) -> Dict[str, Any]
         formatted = format_extraction_results(raw)
     """
     formatted = {}
+    formatted_at = datetime.now().isoformat()  # one timestamp shared by all documents
     
     for doc_type, content in extraction_dict.items():
         formatted[doc_type] = {
             "raw_content": content,
-            "formatted_at": datetime.now().isoformat(),
+            "formatted_at": formatted_at,
             "word_count": len(content.split()) if content else 0
         }
     
@@ -61,16 +62,21 @@ def format_agent_output(agent_output: Dict[str, Any]) -> Dict[str, Any]:
     return formatted
 
 
-def format_dataframe_for_display(df: pd.DataFrame) -> pd.DataFrame:
+def format_dataframe_for_display(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Format dataframe for Streamlit display.
     
     Args:
         df: Input dataframe
+        copy: If False, fill df in place instead of copying it
+              (for callers that own the dataframe)
         
     Returns:
         Formatted dataframe
     """
+    if not copy:
+        df.fillna("N/A", inplace=True)
+        return df
     return df.fillna("N/A")
 
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Dict, Any
-import json
+import orjson
 
 
 def generate_application_report(
@@ -21,7 +21,7 @@ def generate_application_report(
     Returns:
         Formatted report as string
     """
-    report = f"""
+    header = f"""
 {'='*80}
 SOVEREIGN AI VERIFIER - APPLICATION REPORT
 {'='*80}
@@ -39,10 +39,11 @@ EXTRACTED DATA
 {'-'*80}
 """
     
-    for doc_type, content in extraction_results.items():
-        report += f"\n{doc_type}:\n{content}\n"
+    # Collect the sections and join once, rather than growing one string
+    parts = [header]
+    parts.extend(f"\n{doc_type}:\n{content}\n" for doc_type, content in extraction_results.items())
     
-    report += f"""
+    parts.append(f"""
 FINAL DECISION
 {'-'*80}
 Status: {agent_output.get('status', 'UNKNOWN')}
@@ -55,9 +56,9 @@ Confidence: {agent_output.get('ml_prediction_confidence', 0.0):.2%}
 {'='*80}
 END OF REPORT
 {'='*80}
-"""
+""")
     
-    return report
+    return "".join(parts)
 
 
 def generate_audit_report(
@@ -74,7 +75,7 @@ def generate_audit_report(
     Returns:
         Formatted audit report as string
     """
-    report = f"""
+    parts = [f"""
 {'='*80}
 SOVEREIGN AI VERIFIER - AUDIT TRAIL REPORT
 {'='*80}
@@ -85,25 +86,27 @@ Total Actions Logged: {len(audit_logs)}
 
 ACTION TIMELINE
 {'-'*80}
-"""
+"""]
     
+    # One entry per log, joined at the end (long trails stay linear)
+    dumps = orjson.dumps
     for i, log in enumerate(audit_logs, 1):
-        report += f"""
+        parts.append(f"""
 [{i}] AGENT: {log.agent_name.upper()}
     Timestamp: {log.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
     Action: {log.agent_action}
     Status: {log.decision_status or 'N/A'}
-    Input: {json.dumps(log.agent_input, indent=6)}
-    Output: {json.dumps(log.agent_output, indent=6)}
-"""
+    Input: {dumps(log.agent_input, option=orjson.OPT_INDENT_2).decode()}
+    Output: {dumps(log.agent_output, option=orjson.OPT_INDENT_2).decode()}
+""")
     
-    report += f"""
+    parts.append(f"""
 {'-'*80}
 Audit trail complete.
 {'='*80}
-"""
+""")
     
-    return report
+    return "".join(parts)
 
 
 def save_report_to_file(report: str, filename: str) -> bool:
@@ -118,8 +121,10 @@ def save_report_to_file(report: str, filename: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        with open(filename, 'w') as f:
-            f.write(report)
+        # The report is already one string: encode once and write it in a
+        # single buffered call (UTF-8 regardless of platform locale)
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            f.write(report.encode('utf-8'))
         print(f"✅ Report saved to {filename}")
         return True
     except Exception as e:
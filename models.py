@@ -1,11 +1,18 @@
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, JSON
+from sqlalchemy import create_engine, event, desc, make_url, Column, String, Integer, Float, DateTime, Text, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 import uuid
+import orjson
+from config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT
 
 Base = declarative_base()
 
+# JSON text on SQLite; binary, pre-parsed JSONB on PostgreSQL
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 class Application(Base):
     """Main application record - simplified (no decision fields)."""
     __tablename__ = 'applications'
@@ -22,14 +29,19 @@ class Application(Base):
     employment_status = Column(String(100))
     
     # Raw Data Storage
-    extracted_data = Column(JSON, nullable=False)
+    extracted_data = Column(JSONDocument, nullable=False)
     validation_status = Column(String(50))  # VALIDATED, REJECTED
-    validation_errors = Column(JSON)
+    validation_errors = Column(JSONDocument)
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Applications are listed in submission order, paged by (created_at, id)
+    __table_args__ = (
+        Index('ix_applications_created_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Application(id={self.id}, name={self.applicant_name})>"
 
@@ -43,11 +55,16 @@ class DocumentExtraction(Base):
     
     document_type = Column(String(100))
     extraction_status = Column(String(50))  # SUCCESS, FAILED, PARTIAL
-    extracted_content = Column(JSON)
+    extracted_content = Column(JSONDocument)
     extraction_errors = Column(Text)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Extractions are looked up per application (and document type)
+    __table_args__ = (
+        Index('ix_extraction_app_doc', 'application_id', 'document_type'),
+    )
+    
     def __repr__(self):
         return f"<DocumentExtraction(app_id={self.application_id}, doc={self.document_type})>"
 
@@ -63,8 +80,8 @@ class AuditLog(Base):
     agent_action = Column(String(255))
     
     # Agent Inputs & Outputs
-    agent_input = Column(JSON)
-    agent_output = Column(JSON)
+    agent_input = Column(JSONDocument)
+    agent_output = Column(JSONDocument)
     
     # Extracted Decision Fields (from agent_output for easy querying)
     decision_status = Column(String(50))  # VALIDATED, ACCEPTED, SOFT DECLINE, REJECTED
@@ -77,18 +94,91 @@ class AuditLog(Base):
     
     timestamp = Column(DateTime, default=datetime.utcnow)
     
+    # Trail and latest-decision lookups filter by application (and agent)
+    # and order by time; this serves them as an index range scan, no sort
+    __table_args__ = (
+        Index('ix_audit_app_agent_ts', 'application_id', 'agent_name', desc('timestamp')),
+    )
+    
     def __repr__(self):
         return f"<AuditLog(app_id={self.application_id}, agent={self.agent_name})>"
 
 
 # Initialize Database
-DATABASE_URL = "sqlite:///./sovereign_ai.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def _json_serializer(obj):
+    """Serialize JSON columns with orjson (handles NumPy scalars and arrays)."""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+# Pooled connections are reused across requests; pre-ping replaces any the
+# server has dropped. Shared by the sync and async engines.
+_POOL_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT
+}
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    **_POOL_OPTIONS,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the API, so queries do not block the event loop
+ASYNC_DATABASE_URL = (
+    DATABASE_URL
+    .replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    .replace("postgresql://", "postgresql+asyncpg://", 1)
+)
+
+# PgBouncer in transaction mode cannot keep prepared statements across
+# transactions, so asyncpg's statement caches are turned off. These options
+# exist only for asyncpg; the sync (psycopg2) engine must not receive them
+_async_connect_args = {}
+if ASYNC_DATABASE_URL.startswith("postgresql+asyncpg://"):
+    ASYNC_DATABASE_URL = make_url(ASYNC_DATABASE_URL).update_query_dict(
+        {"prepared_statement_cache_size": "0"}
+    )
+    _async_connect_args = {"statement_cache_size": 0}
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=_async_connect_args,
+    **_POOL_OPTIONS,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers run alongside the writer; NORMAL syncs at checkpoints,
+    not every commit. A 64 MB page cache per pooled connection keeps hot
+    pages in memory between requests, and temporary tables and sort
+    spills stay in memory instead of temp files.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+if DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", _sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+
 def init_db():
-    """Create all tables."""
+    """Create all tables, and any indexes missing from existing tables."""
     Base.metadata.create_all(bind=engine)
+    for table in (Application.__table__, DocumentExtraction.__table__, AuditLog.__table__):
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 if __name__ == "__main__":
     init_db()
@@ -1,8 +1,32 @@
 import time
-from typing import Tuple
-import pandas as pd
-from io import BytesIO
-from .base import BaseDocumentProcessor
+from typing import BinaryIO, Iterator, Tuple
+from .base import BaseDocumentProcessor, DocumentSource, ResultRows
+
+try:
+    from python_calamine import CalamineWorkbook  # Rust xlsx reader, much faster than openpyxl
+except ImportError:
+    CalamineWorkbook = None
+    from openpyxl import load_workbook
+
+VALUE_COLUMN = 'Estimated Value (AED)'
+
+
+def _sheet_rows(stream: BinaryIO) -> Iterator[tuple]:
+    """Yield the first sheet's rows as tuples of cell values (header first)."""
+    if CalamineWorkbook is not None:
+        yield from map(tuple, CalamineWorkbook.from_filelike(stream).get_sheet_by_index(0).to_python())
+        return
+    # Read-only mode streams rows instead of building the whole workbook
+    wb = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        yield from wb.worksheets[0].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 
 class AssetsProcessor(BaseDocumentProcessor):
     """Processor for Assets/Liabilities Excel files."""
@@ -11,7 +35,7 @@ class AssetsProcessor(BaseDocumentProcessor):
         super().__init__(ui_data)
         self.document_label = "Assets"
     
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Extract: Total asset value from Excel.
         Note: No identity check for Excel files.
@@ -19,14 +43,17 @@ class AssetsProcessor(BaseDocumentProcessor):
         start = time.perf_counter()
         
         try:
-            df_xl = pd.read_excel(BytesIO(file_bytes))
+            # Sum straight from the sheet rows; no DataFrame is built
+            sheet_rows = _sheet_rows(self._as_stream(file_bytes))
+            header = next(sheet_rows, ())
             
             # Calculate total asset value
-            if 'Estimated Value (AED)' in df_xl.columns:
-                total = df_xl['Estimated Value (AED)'].sum()
+            if VALUE_COLUMN in header:
+                col = header.index(VALUE_COLUMN)
+                total = sum(row[col] for row in sheet_rows if len(row) > col and _is_number(row[col]))
             else:
-                # Fallback: sum all numeric columns
-                total = df_xl.select_dtypes(include=['number']).sum().sum()
+                # Fallback: sum all numeric cells
+                total = sum(value for row in sheet_rows for value in row if _is_number(value))
             
             # Build result
             rows = [
@@ -37,13 +64,11 @@ class AssetsProcessor(BaseDocumentProcessor):
                 }
             ]
             
-            df = self._create_result_dataframe(rows)
-            
             # Store verification result
             self.verification_result = f"Total Value: {total:,.2f}"
             self.processing_time = time.perf_counter() - start
             
-            return True, df, self.processing_time
+            return True, rows, self.processing_time
             
         except Exception as e:
             print(f"❌ Error processing assets file: {e}")
@@ -54,5 +79,4 @@ class AssetsProcessor(BaseDocumentProcessor):
                     "Status": "❌ Failed"
                 }
             ]
-            df = self._create_result_dataframe(rows)
-            return False, df, time.perf_counter() - start
\ No newline at end of file
+            return False, rows, time.perf_counter() - start
\ No newline at end of file
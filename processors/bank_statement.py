@@ -1,10 +1,13 @@
 import re
 import time
 from typing import Tuple
-import pandas as pd
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, DocumentSource, ResultRows
 from utils import clean_val
 
+# Patterns compiled once at import, not looked up per document
+_SALARY_RE = re.compile(r"SALARY TRANSFER\s+([\d,]+\.\d{2})", re.IGNORECASE)
+_AMOUNT_RE = re.compile(r"[\d,]+\.\d{2}")
+
 class BankStatementProcessor(BaseDocumentProcessor):
     """Processor for Bank Statement documents."""
     
@@ -12,7 +15,7 @@ class BankStatementProcessor(BaseDocumentProcessor):
         super().__init__(ui_data)
         self.document_label = "Bank Statement"
     
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Extract: Monthly Salary, Balance.
         Verify: Identity check against UI data.
@@ -23,15 +26,18 @@ class BankStatementProcessor(BaseDocumentProcessor):
         # Verify identity
         id_ok, id_status = self._verify_identity_logic(text)
         
-        clean_text = text.replace('"', '').replace('\n', ' ')
+        clean_text = self._clean_text(text)
         
         # Extract salary (first SALARY TRANSFER)
-        salary_match = re.search(r"SALARY TRANSFER\s+([\d,]+\.\d{2})", clean_text, re.IGNORECASE)
+        salary_match = _SALARY_RE.search(clean_text)
         val_sal = salary_match.group(1) if salary_match else "0.00"
         
-        # Extract latest balance
-        all_amounts = re.findall(r"[\d,]+\.\d{2}", clean_text)
-        val_bal = all_amounts[-1] if all_amounts else "0.00"
+        # Extract latest balance (the last amount on the statement); walk
+        # the matches without building a list of every amount
+        last_amount = None
+        for last_amount in _AMOUNT_RE.finditer(clean_text):
+            pass
+        val_bal = last_amount.group(0) if last_amount else "0.00"
         
         # Build result
         rows = [
@@ -52,10 +58,8 @@ class BankStatementProcessor(BaseDocumentProcessor):
             }
         ]
         
-        df = self._create_result_dataframe(rows)
-        
         # Store verification result
         self.verification_result = f"Salary: {val_sal}, Balance: {val_bal}"
         self.processing_time = time.perf_counter() - start
         
-        return id_ok, df, self.processing_time
\ No newline at end of file
+        return id_ok, rows, self.processing_time
\ No newline at end of file
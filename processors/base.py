@@ -1,11 +1,142 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
-import pandas as pd
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import os
+import re
+import threading
 import time
 from io import BytesIO
 from pypdf import PdfReader
+from config import PDF_BACKEND, PDF_TEXT_CACHE_DIR, PDF_TEXT_CACHE_ENTRIES
 from utils import extract_text_after_label
 
+# Raw bytes or an open binary file (e.g. an upload's spooled temp file)
+DocumentSource = Union[bytes, BinaryIO]
+
+# Result table rows with keys Field, Extracted, Status (st.dataframe renders
+# them directly, so no DataFrame is built per document)
+ResultRows = List[Dict[str, str]]
+
+try:
+    import pypdfium2  # PDFium bindings; text extraction in C, much faster than pypdf
+except ImportError:
+    pypdfium2 = None
+
+# PDFium when installed, unless PDF_BACKEND forces pypdf
+PDF_ENGINE = "pdfium" if pypdfium2 is not None and PDF_BACKEND != "pypdf" else "pypdf"
+
+# PDFium is not thread-safe, so one process-wide lock serializes all PDFium
+# calls. Trade-off: PDF text extraction runs one document at a time, even
+# from the process_documents thread pool or concurrent API uploads; only
+# cache hits, hashing and the spreadsheet reader overlap. PDFium's per-page
+# speed over pypdf still outweighs the lost parallelism for these
+# few-page documents
+_pdfium_lock = threading.Lock()
+
+# Drops double quotes and joins lines, in a single pass over the text
+_CLEAN_TABLE = str.maketrans({'"': None, '\n': ' '})
+
+# Most recently extracted texts, in front of the disk cache; processors run
+# in worker threads, so access is locked
+_text_cache = OrderedDict()  # content hash -> text
+_text_cache_lock = threading.Lock()
+
+
+def _content_hash(source: DocumentSource) -> str:
+    """Hash raw bytes directly, or a stream's content in 1 MB blocks (then rewind it)."""
+    if isinstance(source, bytes):
+        return hashlib.blake2b(source, digest_size=16).hexdigest()
+    stream = source
+    digest = hashlib.blake2b(digest_size=16)
+    for block in iter(lambda: stream.read(1 << 20), b""):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def _extract_text(source: DocumentSource) -> str:
+    """
+    Concatenated text of all pages, via PDF_ENGINE (PDFium or pypdf).
+    
+    PDFium opens raw bytes in place (no stream wrapper or read copies);
+    pypdf needs a stream, so bytes are wrapped for it.
+    """
+    if PDF_ENGINE == "pdfium":
+        with _pdfium_lock:
+            pdf = pypdfium2.PdfDocument(source)
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_bounded())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        # PDFium ends lines with \r\n; processors expect \n
+        return "\n".join(pages).replace("\r\n", "\n")
+    reader = PdfReader(BytesIO(source) if isinstance(source, bytes) else source)
+    return "\n".join([page.extract_text() for page in reader.pages])
+
+
+@lru_cache(maxsize=128)
+def _keyword_re(keyword: str) -> re.Pattern:
+    """Case-insensitive literal pattern, compiled once per keyword."""
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+
+def _remember_text(key: str, text: str) -> None:
+    """Keep text in the in-memory LRU, evicting the oldest entries."""
+    if PDF_TEXT_CACHE_ENTRIES <= 0:
+        return
+    with _text_cache_lock:
+        _text_cache[key] = text
+        _text_cache.move_to_end(key)
+        while len(_text_cache) > PDF_TEXT_CACHE_ENTRIES:
+            _text_cache.popitem(last=False)
+
+
+def _read_cached_text(key: str) -> Optional[str]:
+    """Return cached PDF text for a content hash (memory, then disk), or None on a miss."""
+    with _text_cache_lock:
+        text = _text_cache.get(key)
+        if text is not None:
+            _text_cache.move_to_end(key)
+            return text
+    if not PDF_TEXT_CACHE_DIR:
+        return None
+    try:
+        with open(os.path.join(PDF_TEXT_CACHE_DIR, f"{key}.txt"), encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    _remember_text(key, text)
+    return text
+
+
+def _write_cached_text(key: str, text: str) -> None:
+    """
+    Store extracted PDF text under its content hash.
+    
+    Written to a temp file and renamed, so concurrent readers never see a
+    partial entry. Cache failures are ignored; the text is already parsed.
+    """
+    _remember_text(key, text)
+    if not PDF_TEXT_CACHE_DIR:
+        return
+    path = os.path.join(PDF_TEXT_CACHE_DIR, f"{key}.txt")
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
 class BaseDocumentProcessor(ABC):
     """
     Abstract base class for all document processors.
@@ -21,23 +152,58 @@ class BaseDocumentProcessor(ABC):
             ui_data: User input data containing name, address, emirates_id, etc.
         """
         self.ui_data = ui_data
+        # Identity needles derived once from the form data
+        self._id_val = str(ui_data.get('emirates_id', ''))
+        self._addr_keyword = ui_data.get('address', '').split(',')[0].strip().lower()
         self.document_label = "Unknown"
         self.verification_result = ""
         self.processing_time = 0.0
     
-    def _get_pdf_text(self, file_bytes: bytes) -> str:
+    @staticmethod
+    def _as_stream(file_bytes: DocumentSource) -> BinaryIO:
         """
-        Extract raw text from PDF bytes.
+        Wrap bytes in a stream; file objects are read in place without
+        copying their content into memory first.
+        """
+        if isinstance(file_bytes, (bytes, bytearray, memoryview)):
+            return BytesIO(file_bytes)
+        file_bytes.seek(0)
+        return file_bytes
+    
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """Text with double quotes removed and newlines turned into spaces."""
+        return text.translate(_CLEAN_TABLE)
+    
+    def _get_pdf_text(self, file_bytes: DocumentSource) -> str:
+        """
+        Extract raw text from a PDF.
+        
+        Parsed text is cached under a hash of the file content, in memory
+        (the last PDF_TEXT_CACHE_ENTRIES documents) and on disk
+        (PDF_TEXT_CACHE_DIR), so re-processing the same documents skips
+        the page-by-page parse. Changed files hash differently, so entries
+        never go stale.
         
         Args:
-            file_bytes: PDF file as bytes
+            file_bytes: PDF file as bytes or an open binary file
             
         Returns:
             Concatenated text from all pages
         """
         try:
-            reader = PdfReader(BytesIO(file_bytes))
-            text = "\n".join([page.extract_text() for page in reader.pages])
+            # Raw bytes are hashed and parsed as they are; anything else as a stream
+            source = file_bytes if isinstance(file_bytes, bytes) else self._as_stream(file_bytes)
+            caching = PDF_TEXT_CACHE_DIR or PDF_TEXT_CACHE_ENTRIES > 0
+            # The engine is part of the key, since the engines lay out text differently
+            key = f"{PDF_ENGINE}-{_content_hash(source)}" if caching else None
+            if key:
+                cached = _read_cached_text(key)
+                if cached is not None:
+                    return cached
+            text = _extract_text(source)
+            if key:
+                _write_cached_text(key, text)
             return text
         except Exception as e:
             print(f"❌ Error extracting PDF text: {e}")
@@ -57,46 +223,35 @@ class BaseDocumentProcessor(ABC):
         Returns:
             (is_valid, status_message)
         """
-        id_val = str(self.ui_data.get('emirates_id', ''))
+        id_val = self._id_val
         id_found = id_val in text
         
-        addr_keyword = self.ui_data.get('address', '').split(',')[0].strip().lower()
-        addr_found = addr_keyword in text.lower()
+        addr_keyword = self._addr_keyword
+        # Case-insensitive scan in place; avoids lower-casing a copy of the whole document
+        addr_found = _keyword_re(addr_keyword).search(text) is not None
+        
+        # Common case: both present, nothing to report
+        if id_found and addr_found:
+            return True, "✅ Pass"
         
         mismatches = []
         if not id_found:
             mismatches.append(f"ID {id_val} missing")
         if not addr_found:
             mismatches.append(f"address keyword '{addr_keyword}' missing")
-        
-        if not mismatches:
-            return True, "✅ Pass"
-        else:
-            return False, f"❌ Fail ({', '.join(mismatches)} in {self.document_label})"
+        return False, f"❌ Fail ({', '.join(mismatches)} in {self.document_label})"
     
     @abstractmethod
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Process document and extract data.
         
         Must be implemented by subclasses.
         
         Args:
-            file_bytes: File content as bytes
+            file_bytes: File content as bytes or an open binary file
             
         Returns:
-            (is_valid, dataframe_with_results, processing_time_seconds)
+            (is_valid, result_rows, processing_time_seconds)
         """
         pass
-    
-    def _create_result_dataframe(self, rows: list) -> pd.DataFrame:
-        """
-        Helper to create standardized result dataframe.
-        
-        Args:
-            rows: List of dicts with keys: Field, Extracted, Status
-            
-        Returns:
-            Formatted pandas DataFrame
-        """
-        return pd.DataFrame(rows)
\ No newline at end of file
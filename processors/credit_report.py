@@ -1,10 +1,19 @@
 import re
 import time
 from typing import Tuple
-import pandas as pd
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, DocumentSource, ResultRows
 from utils import clean_val
 
+# All four fields in one pattern, so the text is scanned once; each
+# alternative has a single named group, reported by match.lastgroup
+_CREDIT_RE = re.compile(
+    r"Reported Monthly Income:\s*(?P<income>[\d,]+\.\d{2})"
+    r"|Credit Score:\s*(?P<score>\d+)"
+    r"|Total Savings:\s*(?P<savings>[\d,]+\.\d{2})"
+    r"|Total Outstanding Balance:\s*(?P<debt>[\d,]+\.\d{2})",
+    re.IGNORECASE
+)
+
 class CreditReportProcessor(BaseDocumentProcessor):
     """Processor for Credit Report documents."""
     
@@ -12,7 +21,7 @@ class CreditReportProcessor(BaseDocumentProcessor):
         super().__init__(ui_data)
         self.document_label = "Credit Report"
     
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Extract: Credit Score, Income, Savings, Debt.
         Verify: Identity check against UI data.
@@ -23,18 +32,17 @@ class CreditReportProcessor(BaseDocumentProcessor):
         # Verify identity
         id_ok, id_status = self._verify_identity_logic(text)
         
-        clean_text = text.replace('"', '').replace('\n', ' ')
+        clean_text = self._clean_text(text)
         
-        # Extract fields
-        income = re.search(r"Reported Monthly Income:\s*([\d,]+\.\d{2})", clean_text, re.IGNORECASE)
-        score = re.search(r"Credit Score:\s*(\d+)", clean_text, re.IGNORECASE)
-        savings = re.search(r"Total Savings:\s*([\d,]+\.\d{2})", clean_text, re.IGNORECASE)
-        debt = re.search(r"Total Outstanding Balance:\s*([\d,]+\.\d{2})", clean_text, re.IGNORECASE)
+        # Extract fields (first occurrence of each, as with separate searches)
+        fields = {}
+        for match in _CREDIT_RE.finditer(clean_text):
+            fields.setdefault(match.lastgroup, match.group(match.lastgroup))
         
-        val_inc = income.group(1) if income else "0.00"
-        val_score = score.group(1) if score else "0"
-        val_sav = savings.group(1) if savings else "0.00"
-        val_debt = debt.group(1) if debt else "0.00"
+        val_inc = fields.get('income', "0.00")
+        val_score = fields.get('score', "0")
+        val_sav = fields.get('savings', "0.00")
+        val_debt = fields.get('debt', "0.00")
         
         # Build result
         rows = [
@@ -65,10 +73,8 @@ class CreditReportProcessor(BaseDocumentProcessor):
             }
         ]
         
-        df = self._create_result_dataframe(rows)
-        
         # Store verification result
         self.verification_result = f"Score: {val_score}, Income: {val_inc}, Savings: {val_sav}, Debt: {val_debt}"
         self.processing_time = time.perf_counter() - start
         
-        return id_ok, df, self.processing_time
\ No newline at end of file
+        return id_ok, rows, self.processing_time
\ No newline at end of file
@@ -1,10 +1,15 @@
 import re
 import time
 from typing import Tuple
-import pandas as pd
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, DocumentSource, ResultRows
 from utils import extract_text_after_label
 
+# Patterns compiled once at import, not looked up per document
+_ID_NUM_RE = re.compile(r"ID Number:\s*(\d+)")
+_NAME_RE = re.compile(r"Name:\s*(.*)")
+_MARITAL_RE = re.compile(r"Marital Status:\s*(\w+)")
+_FAM_RE = re.compile(r"Family Size:\s*(\d+)")
+
 class EmiratesIDProcessor(BaseDocumentProcessor):
     """Processor for Emirates ID documents."""
     
@@ -12,7 +17,7 @@ class EmiratesIDProcessor(BaseDocumentProcessor):
         super().__init__(ui_data)
         self.document_label = "Emirates ID"
     
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Extract: ID, Name, Marital Status, Family Size.
         Verify: Identity check against UI data.
@@ -24,10 +29,10 @@ class EmiratesIDProcessor(BaseDocumentProcessor):
         id_ok, id_status = self._verify_identity_logic(text)
         
         # Extract fields
-        id_num = re.search(r"ID Number:\s*(\d+)", text)
-        name = re.search(r"Name:\s*(.*)", text)
-        marital = re.search(r"Marital Status:\s*(\w+)", text)
-        fam_size = re.search(r"Family Size:\s*(\d+)", text)
+        id_num = _ID_NUM_RE.search(text)
+        name = _NAME_RE.search(text)
+        marital = _MARITAL_RE.search(text)
+        fam_size = _FAM_RE.search(text)
         
         val_id = id_num.group(1).strip() if id_num else "Not Found"
         val_name = name.group(1).strip() if name else "Not Found"
@@ -61,10 +66,8 @@ class EmiratesIDProcessor(BaseDocumentProcessor):
             }
         ]
         
-        df = self._create_result_dataframe(rows)
-        
         # Store verification result for later use
         self.verification_result = f"ID: {val_id}, Name: {val_name}, Marital: {val_mar}, Family: {val_fam}"
         self.processing_time = time.perf_counter() - start
         
-        return id_match, df, self.processing_time
\ No newline at end of file
+        return id_match, rows, self.processing_time
\ No newline at end of file
@@ -1,7 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Type
 
 # Import base first
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, DocumentSource
 
 # Import all processors
 from .emirates_id import EmiratesIDProcessor
@@ -47,7 +48,7 @@ class ProcessorFactory:
             
         Example:
             processor = ProcessorFactory.create_processor("ID", ui_data)
-            is_valid, df, time_taken = processor.process(file_bytes)
+            is_valid, rows, time_taken = processor.process(file_bytes)
         """
         processor_class = ProcessorFactory._PROCESSORS.get(doc_type)
         
@@ -103,12 +104,17 @@ class ProcessorFactory:
         print(f"✅ Registered processor for document type: {doc_type}")
     
     @staticmethod
-    def process_documents(doc_mapping: Dict[str, bytes], ui_data: dict) -> Dict:
+    def process_documents(doc_mapping: Dict[str, DocumentSource], ui_data: dict) -> Dict:
         """
-        Batch process multiple documents.
+        Batch process multiple documents in a thread pool.
+        
+        File reads, content hashing, text-cache lookups and spreadsheet
+        parsing overlap; PDFium text extraction itself is serialized by
+        a lock in processors.base, so uncached PDFs are extracted one at
+        a time.
         
         Args:
-            doc_mapping: Dict of {doc_type: file_bytes}
+            doc_mapping: Dict of {doc_type: file bytes or open binary file}
             ui_data: User input data
             
         Returns:
@@ -122,29 +128,40 @@ class ProcessorFactory:
             }
             results = ProcessorFactory.process_documents(doc_mapping, ui_data)
         """
-        results = {}
-        
-        for doc_type, file_bytes in doc_mapping.items():
-            try:
-                processor = ProcessorFactory.create_processor(doc_type, ui_data)
-                is_valid, df, processing_time = processor.process(file_bytes)
-                
-                results[doc_type] = {
-                    "is_valid": is_valid,
-                    "dataframe": df,
-                    "processing_time": processing_time,
-                    "verification_result": processor.verification_result,
-                    "error": None
-                }
-                
-            except Exception as e:
-                results[doc_type] = {
-                    "is_valid": False,
-                    "dataframe": None,
-                    "processing_time": 0.0,
-                    "verification_result": None,
-                    "error": str(e)
-                }
-                print(f"❌ Error processing {doc_type}: {e}")
+        if not doc_mapping:
+            return {}
         
-        return results
\ No newline at end of file
+        # Documents are independent, so run them in worker threads (PDF
+        # extraction still takes turns on the PDFium lock); results keep the
+        # order of doc_mapping
+        with ThreadPoolExecutor(max_workers=len(doc_mapping)) as pool:
+            outcomes = pool.map(
+                lambda item: ProcessorFactory._process_one(item[0], item[1], ui_data),
+                doc_mapping.items()
+            )
+            return dict(zip(doc_mapping, outcomes))
+    
+    @staticmethod
+    def _process_one(doc_type: str, file_bytes: DocumentSource, ui_data: dict) -> Dict:
+        """Process a single document into the process_documents result format."""
+        try:
+            processor = ProcessorFactory.create_processor(doc_type, ui_data)
+            is_valid, rows, processing_time = processor.process(file_bytes)
+            
+            return {
+                "is_valid": is_valid,
+                "rows": rows,
+                "processing_time": processing_time,
+                "verification_result": processor.verification_result,
+                "error": None
+            }
+            
+        except Exception as e:
+            print(f"❌ Error processing {doc_type}: {e}")
+            return {
+                "is_valid": False,
+                "rows": None,
+                "processing_time": 0.0,
+                "verification_result": None,
+                "error": str(e)
+            }
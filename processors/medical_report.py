@@ -1,8 +1,11 @@
 import re
 import time
 from typing import Tuple
-import pandas as pd
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, DocumentSource, ResultRows
+
+# Patterns compiled once at import, not looked up per document
+_DIAGNOSIS_RE = re.compile(r"Diagnosis:\s*(.*)")
+_SEVERITY_RE = re.compile(r"Severity Score:\s*(\d+)/10")
 
 class MedicalReportProcessor(BaseDocumentProcessor):
     """Processor for Medical Report documents."""
@@ -11,7 +14,7 @@ class MedicalReportProcessor(BaseDocumentProcessor):
         super().__init__(ui_data)
         self.document_label = "Medical Report"
     
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Extract: Diagnosis, Severity Score.
         Verify: Identity check against UI data.
@@ -23,8 +26,8 @@ class MedicalReportProcessor(BaseDocumentProcessor):
         id_ok, id_status = self._verify_identity_logic(text)
         
         # Extract fields
-        diag = re.search(r"Diagnosis:\s*(.*)", text)
-        sev = re.search(r"Severity Score:\s*(\d+)/10", text)
+        diag = _DIAGNOSIS_RE.search(text)
+        sev = _SEVERITY_RE.search(text)
         
         val_diag = diag.group(1).strip() if diag else "N/A"
         val_sev = sev.group(1) if sev else "0"
@@ -48,10 +51,8 @@ class MedicalReportProcessor(BaseDocumentProcessor):
             }
         ]
         
-        df = self._create_result_dataframe(rows)
-        
         # Store verification result
         self.verification_result = f"Diagnosis: {val_diag}, Severity: {val_sev}/10"
         self.processing_time = time.perf_counter() - start
         
-        return id_ok, df, self.processing_time
\ No newline at end of file
+        return id_ok, rows, self.processing_time
\ No newline at end of file
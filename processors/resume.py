@@ -1,8 +1,12 @@
 import re
 import time
 from typing import Tuple
-import pandas as pd
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, DocumentSource, ResultRows
+
+# Pattern compiled once at import, not looked up per document. Only the
+# first 50 characters are shown, so the capture stops there instead of
+# copying the rest of the document
+_EXPERIENCE_RE = re.compile(r"WORK EXPERIENCE\s*(.{0,50})", re.DOTALL)
 
 class ResumeProcessor(BaseDocumentProcessor):
     """Processor for Resume documents."""
@@ -11,7 +15,7 @@ class ResumeProcessor(BaseDocumentProcessor):
         super().__init__(ui_data)
         self.document_label = "Resume"
     
-    def process(self, file_bytes: bytes) -> Tuple[bool, pd.DataFrame, float]:
+    def process(self, file_bytes: DocumentSource) -> Tuple[bool, ResultRows, float]:
         """
         Extract: Work Experience summary.
         Verify: Identity check against UI data.
@@ -23,8 +27,8 @@ class ResumeProcessor(BaseDocumentProcessor):
         id_ok, id_status = self._verify_identity_logic(text)
         
         # Extract experience
-        exp = re.search(r"WORK EXPERIENCE\s*(.*)", text, re.DOTALL)
-        val_exp = (exp.group(1).strip()[:50] + "...") if exp else "N/A"
+        exp = _EXPERIENCE_RE.search(text)
+        val_exp = (exp.group(1).rstrip() + "...") if exp else "N/A"
         
         # Build result
         rows = [
@@ -40,10 +44,8 @@ class ResumeProcessor(BaseDocumentProcessor):
             }
         ]
         
-        df = self._create_result_dataframe(rows)
-        
         # Store verification result
         self.verification_result = f"Experience: {val_exp}"
         self.processing_time = time.perf_counter() - start
         
-        return id_ok, df, self.processing_time
\ No newline at end of file
+        return id_ok, rows, self.processing_time
\ No newline at end of file
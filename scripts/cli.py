@@ -1,16 +1,59 @@
 import argparse
+import os
 import sys
+from fnmatch import fnmatch
 from pathlib import Path
 import json
+from contextlib import ExitStack
 from datetime import datetime
 
 from processors import ProcessorFactory
-from agents import build_workflow, AgentState
+from agents import lang_agent, AgentState, audit
+from agents.llm import run_sync
 from db_manager import DatabaseManager
 from helpers import generate_application_report, save_report_to_file
 from config import SUPPORTED_DOCUMENTS
 
 
+# Common file naming patterns per document type, in priority order
+_DOC_PATTERNS = {
+    doc_type: (
+        f"{doc_type}*.pdf",
+        f"{doc_label.replace(' ', '_')}*.pdf",
+        f"{doc_type}*.xlsx",
+        f"{doc_label.replace(' ', '_')}*.xlsx"
+    )
+    for doc_type, doc_label in SUPPORTED_DOCUMENTS.items()
+}
+
+
+def _open_document(path: Path):
+    """
+    Open a document for one front-to-back read.
+    
+    Where supported, the kernel is told the file will be read sequentially,
+    so it reads ahead more aggressively for large statements and reports.
+    """
+    f = open(path, 'rb')
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+
+def _emit(*lines: str) -> None:
+    """
+    Print a block of progress lines with a single write and flush.
+    
+    Each print() to a terminal takes the stdout lock and flushes its own
+    line, so related messages are written together at phase boundaries.
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 def process_single_application(
     documents_dir: str,
     output_dir: str,
@@ -27,9 +70,7 @@ def process_single_application(
     Returns:
         Success status
     """
-    print("\n" + "="*80)
-    print(f"Processing application for: {ui_data['name']}")
-    print("="*80)
+    _emit("\n" + "="*80, f"Processing application for: {ui_data['name']}", "="*80)
     
     # Load documents from directory
     doc_files = {}
@@ -39,51 +80,57 @@ def process_single_application(
         print(f"❌ Documents directory not found: {documents_dir}")
         return False
     
+    # List the directory once and match every pattern against the names,
+    # instead of re-scanning it for each glob
+    with os.scandir(documents_path) as it:
+        entries = [entry for entry in it if entry.is_file()]
+    
     # Map document types to files
+    found_lines = []
     for doc_type, doc_label in SUPPORTED_DOCUMENTS.items():
-        # Try common file naming patterns
-        patterns = [
-            f"{doc_type}*.pdf",
-            f"{doc_label.replace(' ', '_')}*.pdf",
-            f"{doc_type}*.xlsx",
-            f"{doc_label.replace(' ', '_')}*.xlsx"
+        found_files = [
+            Path(entry.path)
+            for pattern in _DOC_PATTERNS[doc_type]
+            for entry in entries
+            if fnmatch(entry.name, pattern)
         ]
         
-        found_files = []
-        for pattern in patterns:
-            found_files.extend(documents_path.glob(pattern))
-        
         if found_files:
             doc_files[doc_type] = found_files[0]
-            print(f"✅ Found {doc_label}: {found_files[0].name}")
+            found_lines.append(f"✅ Found {doc_label}: {found_files[0].name}")
         else:
-            print(f"⚠️  Missing {doc_label}")
+            found_lines.append(f"⚠️  Missing {doc_label}")
+    _emit(*found_lines)
     
     if not doc_files:
         print("❌ No documents found in directory")
         return False
     
-    # Convert file paths to bytes
-    doc_bytes = {}
-    for doc_type, file_path in doc_files.items():
-        try:
-            with open(file_path, 'rb') as f:
-                doc_bytes[doc_type] = f.read()
-        except Exception as e:
-            print(f"❌ Error reading {doc_type}: {e}")
-            return False
-    
-    # Process documents
-    print("\n📄 Processing Documents...")
-    results = ProcessorFactory.process_documents(doc_bytes, ui_data)
+    # Open the files and let the processors read them concurrently, instead
+    # of reading every file into memory one after another first
+    with ExitStack() as stack:
+        doc_streams = {}
+        for doc_type, file_path in doc_files.items():
+            try:
+                doc_streams[doc_type] = stack.enter_context(_open_document(file_path))
+            except Exception as e:
+                print(f"❌ Error reading {doc_type}: {e}")
+                return False
+        
+        # Process documents
+        print("\n📄 Processing Documents...")
+        results = ProcessorFactory.process_documents(doc_streams, ui_data)
     
     # Check for errors
     extraction_errors = []
+    processed_lines = []
     for doc_type, result in results.items():
         if result["error"]:
             extraction_errors.append(f"{doc_type}: {result['error']}")
         else:
-            print(f"✅ Processed {SUPPORTED_DOCUMENTS[doc_type]}")
+            processed_lines.append(f"✅ Processed {SUPPORTED_DOCUMENTS[doc_type]}")
+    if processed_lines:
+        _emit(*processed_lines)
     
     if extraction_errors:
         print(f"❌ Extraction errors: {extraction_errors}")
@@ -99,8 +146,6 @@ def process_single_application(
     # Run agent workflow
     print("\n🤖 Running Agent Workflow...")
     try:
-        workflow = build_workflow()
-        
         initial_state: AgentState = {
             "application_id": ui_data.get('application_id', 'CLI-' + datetime.now().strftime('%Y%m%d%H%M%S')),
             "ui_data": ui_data,
@@ -115,7 +160,7 @@ def process_single_application(
             "ml_prediction_confidence": 0.0
         }
         
-        final_output = workflow.invoke(initial_state)
+        final_output = run_sync(lang_agent.ainvoke(initial_state))
         
     except Exception as e:
         print(f"❌ Workflow error: {e}")
@@ -140,13 +185,15 @@ def process_single_application(
         print(f"✅ Report saved: {report_file}")
     
     # Print decision
-    print("\n" + "="*80)
-    print("FINAL DECISION")
-    print("="*80)
-    print(f"Status: {final_output.get('status', 'UNKNOWN')}")
-    print(f"Decision: {final_output.get('final_decision', 'N/A')}")
-    print(f"Eligible: {'Yes' if final_output.get('is_eligible') else 'No'}")
-    print(f"Confidence: {final_output.get('ml_prediction_confidence', 0.0):.2%}")
+    _emit(
+        "\n" + "="*80,
+        "FINAL DECISION",
+        "="*80,
+        f"Status: {final_output.get('status', 'UNKNOWN')}",
+        f"Decision: {final_output.get('final_decision', 'N/A')}",
+        f"Eligible: {'Yes' if final_output.get('is_eligible') else 'No'}",
+        f"Confidence: {final_output.get('ml_prediction_confidence', 0.0):.2%}"
+    )
     
     return True
 
@@ -240,6 +287,9 @@ def main():
     # Process application
     success = process_single_application(args.docs, args.output, ui_data)
     
+    # Make sure queued audit rows reach the database before exiting
+    audit.flush()
+    
     sys.exit(0 if success else 1)
 
 
@@ -1,6 +1,7 @@
 import os
 import json
 import random
+import multiprocessing
 import pandas as pd
 from faker import Faker
 from PIL import Image, ImageDraw, ImageFont
@@ -12,6 +13,9 @@ from datetime import datetime, timedelta
 
 fake = Faker()
 
+# Deletion table for stripping digits from generated addresses
+_DIGIT_STRIP = str.maketrans('', '', '0123456789')
+
 def create_directory(case_id):
     dir_name = f"applicant_documents/{case_id}"
     os.makedirs(dir_name, exist_ok=True)
@@ -35,22 +39,31 @@ def generate_bank_statement(dir_name, data):
     current_balance = data['total_savings']
     transactions = []
 
+    # Amounts stay numeric (date, description, debit, credit) and are only
+    # formatted when the table rows are built
     for month in [10, 11, 12]:
         date = f"2025-{month:02d}-01"
-        transactions.append([date, "SALARY TRANSFER", "", f"{actual_salary:,.2f}"])
+        transactions.append((date, "SALARY TRANSFER", 0, actual_salary))
     
+    # Purchase dates within the last 90 days, drawn directly rather than through Faker
+    today = datetime.now().date()
     for _ in range(10):
-        date = fake.date_between(start_date='-90d', end_date='today').strftime("%Y-%m-%d")
+        date = (today - timedelta(days=random.randint(0, 90))).isoformat()
         expense = random.randint(100, 2000)
-        transactions.append([date, f"{fake.company()} - POS Purchase", f"{expense:,.2f}", ""])
+        transactions.append((date, f"{fake.company()} - POS Purchase", expense, 0))
 
-    transactions.sort(key=lambda x: datetime.strptime(x[0], "%Y-%m-%d"))
+    # ISO dates (YYYY-MM-DD) sort correctly as strings; no need to parse them
+    transactions.sort(key=lambda x: x[0])
 
-    for t in transactions:
-        debit = float(t[2].replace(',', '')) if t[2] else 0
-        credit = float(t[3].replace(',', '')) if t[3] else 0
+    for date, description, debit, credit in transactions:
         current_balance = current_balance + credit - debit
-        table_data.append([t[0], t[1], t[2], t[3], f"{current_balance:,.2f}"])
+        table_data.append([
+            date,
+            description,
+            f"{debit:,.2f}" if debit else "",
+            f"{credit:,.2f}" if credit else "",
+            f"{current_balance:,.2f}"
+        ])
         
     table = Table(table_data, colWidths=[80, 200, 80, 80, 90])
     table.setStyle(TableStyle([
@@ -91,11 +104,16 @@ def generate_emirates_id(dir_name, data, is_mismatch=False):
     start_y = 680
     line_spacing = 30
     
-    c.drawString(start_x, start_y, f"ID Number: {display_id}")
-    c.drawString(start_x, start_y - line_spacing, f"Name: {data['name']}")
-    c.drawString(start_x, start_y - (2 * line_spacing), f"Address: {data['address']}")
-    c.drawString(start_x, start_y - (3 * line_spacing), f"Family Size: {data['family_size']}")
-    c.drawString(start_x, start_y - (4 * line_spacing), f"Marital Status: {data['marital_status']}")
+    # One text object for the evenly spaced fields instead of a positioned string per line
+    fields = c.beginText(start_x, start_y)
+    fields.setFont("Helvetica", 14)
+    fields.setLeading(line_spacing)
+    fields.textLine(f"ID Number: {display_id}")
+    fields.textLine(f"Name: {data['name']}")
+    fields.textLine(f"Address: {data['address']}")
+    fields.textLine(f"Family Size: {data['family_size']}")
+    fields.textLine(f"Marital Status: {data['marital_status']}")
+    c.drawText(fields)
     
     c.save()
 
@@ -103,7 +121,8 @@ def generate_emirates_id(dir_name, data, is_mismatch=False):
 def generate_assets_excel(dir_name, data):
     filepath = os.path.join(dir_name, "assets_liabilities.xlsx")
     df = pd.DataFrame(data['assets_list'], columns=['Asset Type', 'Description', 'Estimated Value (AED)'])
-    df.to_excel(filepath, index=False)
+    # xlsxwriter streams rows out (constant_memory) instead of building an openpyxl workbook
+    df.to_excel(filepath, index=False, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}})
 
 # --- 4. CREDIT REPORT ---
 def generate_credit_report(dir_name, data):
@@ -115,10 +134,15 @@ def generate_credit_report(dir_name, data):
     c.drawString(50, 720, f"Subject Name: {data['name']} | ID: {data['id_number']}")
     c.drawString(50, 705, f"Address: {data['address']}")
     c.line(50, 695, 550, 695)
-    c.drawString(50, 675, f"Reported Monthly Income: {data['monthly_income']:,.2f} AED")
-    c.drawString(50, 660, f"Total Savings: {data['total_savings']:,.2f} AED")
-    c.drawString(50, 645, f"Total Outstanding Balance: {data['outstanding_balance']:,.2f} AED")
-    c.drawString(50, 615, f"Credit Score: {data['credit_score']}")
+    figures = c.beginText(50, 675)
+    figures.setFont("Helvetica", 11)
+    figures.setLeading(15)
+    figures.textLine(f"Reported Monthly Income: {data['monthly_income']:,.2f} AED")
+    figures.textLine(f"Total Savings: {data['total_savings']:,.2f} AED")
+    figures.textLine(f"Total Outstanding Balance: {data['outstanding_balance']:,.2f} AED")
+    figures.textLine()
+    figures.textLine(f"Credit Score: {data['credit_score']}")
+    c.drawText(figures)
     c.save()
 
 # --- 5. MEDICAL REPORT ---
@@ -128,9 +152,13 @@ def generate_medical_report(dir_name, data):
     c.setFont("Helvetica-Bold", 16)
     c.drawString(50, 750, "MINISTRY OF HEALTH - DIAGNOSTIC REPORT")
     c.setFont("Helvetica", 11)
-    c.drawString(50, 720, f"Patient Name: {data['name']} | ID: {data['id_number']}")
-    c.drawString(50, 705, f"Address: {data['address']}")
-    c.drawString(50, 690, f"Report Date: 2026-01-03")
+    header = c.beginText(50, 720)
+    header.setFont("Helvetica", 11)
+    header.setLeading(15)
+    header.textLine(f"Patient Name: {data['name']} | ID: {data['id_number']}")
+    header.textLine(f"Address: {data['address']}")
+    header.textLine(f"Report Date: 2026-01-03")
+    c.drawText(header)
     c.line(50, 680, 550, 680)
     c.drawString(50, 650, "CLINICAL FINDINGS:")
     c.drawString(50, 630, f"Diagnosis: {data['medical_findings']}")
@@ -159,6 +187,54 @@ def generate_resume(dir_name, data):
 # --- ORCHESTRATION ---
 # =========================================
 
+def _init_worker():
+    """Reseed each worker, so forked processes do not repeat the parent's random names and values."""
+    random.seed()
+    fake.seed_instance(random.getrandbits(64))
+
+def _generate_one(c):
+    dir_name = create_directory(c['id'])
+    name = fake.name()
+    
+    # 1. ID Number: 6-digit value without special characters
+    id_num = fake.numerify('######')
+    
+    # 2. Address: Only Street and City (No numbers)
+    # Using .translate to remove any digits if faker includes them by chance
+    raw_street = fake.street_name()
+    raw_city = fake.city()
+    clean_address = f"{raw_street}, {raw_city}".translate(_DIGIT_STRIP)
+    
+    age = random.randint(25, 55)
+    
+    data = {
+        "name": name, 
+        "id_number": id_num, 
+        "address": clean_address, 
+        "age": age,
+        "dob": str(fake.date_of_birth(minimum_age=age, maximum_age=age)),
+        "family_size": random.randint(1, 5), 
+        "marital_status": "Married",
+        "monthly_income": c['income'], 
+        "total_savings": random.randint(10000, 40000),
+        "outstanding_balance": random.randint(0, 5000), 
+        "credit_score": random.randint(600, 800),
+        "actual_bank_income": c['bank'], 
+        "email": fake.email(),
+        "medical_findings": "Generally Fit", 
+        "medical_severity": 0,
+        "resume_summary": "Looking for growth.", 
+        "experience_summary": "10 years exp.",
+        "assets_list": [["Primary Residence", "Owned" if c['assets'] > 0 else "Rented", c['assets']], ["Vehicle", "Personal", 35000]]
+    }
+
+    generate_bank_statement(dir_name, data)
+    generate_emirates_id(dir_name, data, is_mismatch=(c['mismatch']=="id"))
+    generate_assets_excel(dir_name, data)
+    generate_credit_report(dir_name, data)
+    generate_medical_report(dir_name, data)
+    generate_resume(dir_name, data)
+
 def execute_generation():
     configs = [
         {"id": "ideal_1", "income": 4000, "bank": 4000, "assets": 0, "mismatch": None},
@@ -170,48 +246,9 @@ def execute_generation():
         {"id": "asset_fraud", "income": 6000, "bank": 6000, "assets": 3200000, "mismatch": "asset"}
     ]
 
-    for c in configs:
-        dir_name = create_directory(c['id'])
-        name = fake.name()
-        
-        # 1. ID Number: 6-digit value without special characters
-        id_num = fake.numerify('######')
-        
-        # 2. Address: Only Street and City (No numbers)
-        # Using .translate to remove any digits if faker includes them by chance
-        raw_street = fake.street_name()
-        raw_city = fake.city()
-        clean_address = f"{raw_street}, {raw_city}".translate(str.maketrans('', '', '0123456789'))
-        
-        age = random.randint(25, 55)
-        
-        data = {
-            "name": name, 
-            "id_number": id_num, 
-            "address": clean_address, 
-            "age": age,
-            "dob": str(fake.date_of_birth(minimum_age=age, maximum_age=age)),
-            "family_size": random.randint(1, 5), 
-            "marital_status": "Married",
-            "monthly_income": c['income'], 
-            "total_savings": random.randint(10000, 40000),
-            "outstanding_balance": random.randint(0, 5000), 
-            "credit_score": random.randint(600, 800),
-            "actual_bank_income": c['bank'], 
-            "email": fake.email(),
-            "medical_findings": "Generally Fit", 
-            "medical_severity": 0,
-            "resume_summary": "Looking for growth.", 
-            "experience_summary": "10 years exp.",
-            "assets_list": [["Primary Residence", "Owned" if c['assets'] > 0 else "Rented", c['assets']], ["Vehicle", "Personal", 35000]]
-        }
-
-        generate_bank_statement(dir_name, data)
-        generate_emirates_id(dir_name, data, is_mismatch=(c['mismatch']=="id"))
-        generate_assets_excel(dir_name, data)
-        generate_credit_report(dir_name, data)
-        generate_medical_report(dir_name, data)
-        generate_resume(dir_name, data)
+    # Each case writes its own directory, so cases are generated in parallel
+    with multiprocessing.Pool(processes=min(len(configs), os.cpu_count() or 1), initializer=_init_worker) as pool:
+        pool.map(_generate_one, configs)
 
     print("Success: Updated cases generated with 6-digit IDs and alpha-only addresses.")
 
@@ -1,71 +1,81 @@
 import pandas as pd
 import numpy as np
-import random
 
-def generate_balanced_support_data(n_total=1000):
+def generate_balanced_support_data(n_total=1000, batch_size=4096, seed=None):
     """
     Generates a balanced dataset (50/50 split) for Social Support Eligibility.
     Target: 1 (Accept), 0 (Reject)
+    
+    Candidate profiles are drawn batch_size at a time as NumPy arrays and
+    the rulebook is applied to the whole batch at once; batches are drawn
+    until both classes are full.
     """
-    data = []
-    count_1 = 0
-    count_0 = 0
+    rng = np.random.default_rng(seed)
     target_per_class = n_total // 2
 
     # Categorical options
-    emp_statuses = ['Employed', 'Unemployed', 'Retired', 'Student']
-    marital_options = ['Single', 'Married', 'Divorced', 'Widowed']
+    emp_statuses = np.array(['Employed', 'Unemployed', 'Retired', 'Student'])
+    marital_options = np.array(['Single', 'Married', 'Divorced', 'Widowed'])
+
+    accepted, rejected = [], []
+    n_accepted = n_rejected = 0
 
-    while (count_1 + count_0) < n_total:
-        # --- 1. Generate Random Profile ---
-        age = random.randint(18, 85)
-        family_size = random.randint(1, 10)
-        dependents = random.randint(0, family_size - 1)
-        income = random.randint(2000, 45000)
-        savings = random.randint(0, 1500000)
-        property_val = random.choices([0, random.randint(200000, 3000000)], weights=[0.7, 0.3])[0]
-        has_disability = random.choices([0, 1], weights=[0.85, 0.15])[0]
-        med_severity = random.randint(0, 10)
-        status = random.choice(emp_statuses)
-        marital = random.choice(marital_options)
+    while n_accepted < target_per_class or n_rejected < target_per_class:
+        # --- 1. Generate Random Profiles ---
+        age = rng.integers(18, 86, batch_size)
+        family_size = rng.integers(1, 11, batch_size)
+        dependents = rng.integers(0, family_size)
+        income = rng.integers(2000, 45001, batch_size)
+        savings = rng.integers(0, 1500001, batch_size)
+        owns_property = rng.random(batch_size) < 0.3
+        property_val = np.where(owns_property, rng.integers(200000, 3000001, batch_size), 0)
+        has_disability = (rng.random(batch_size) < 0.15).astype(int)
+        med_severity = rng.integers(0, 11, batch_size)
+        status = emp_statuses[rng.integers(0, len(emp_statuses), batch_size)]
+        marital = marital_options[rng.integers(0, len(marital_options), batch_size)]
 
         # --- 2. Apply Rulebook Logic ---
         # Household threshold: 12,000 base + 3,000 per dependent
         threshold = 12000 + (dependents * 3000)
         
-        # Primary check
-        eligible = 0
-        if (income < threshold) and (property_val < 1000000) and (age >= 21):
-            eligible = 1
-        
-        # Override: Disability increases income threshold by 50%
-        if has_disability == 1 and income < (threshold * 1.5) and property_val < 1200000:
-            eligible = 1
+        # Primary check, plus override: disability increases income threshold by 50%
+        eligible = (
+            ((income < threshold) & (property_val < 1000000) & (age >= 21))
+            | ((has_disability == 1) & (income < threshold * 1.5) & (property_val < 1200000))
+        )
+
+        batch = pd.DataFrame({
+            'age': age,
+            'marital_status': marital,
+            'family_size': family_size,
+            'dependents': dependents,
+            'monthly_income': income,
+            'total_savings': savings,
+            'property_value': property_val,
+            'has_disability': has_disability,
+            'medical_severity': med_severity,
+            'employment_status': status,
+            'label': eligible.astype(int)
+        })
 
         # --- 3. Balancing logic ---
-        if eligible == 1 and count_1 < target_per_class:
-            data.append([age, marital, family_size, dependents, income, savings, 
-                         property_val, has_disability, med_severity, status, 1])
-            count_1 += 1
-        elif eligible == 0 and count_0 < target_per_class:
-            data.append([age, marital, family_size, dependents, income, savings, 
-                         property_val, has_disability, med_severity, status, 0])
-            count_0 += 1
+        take_1 = np.flatnonzero(eligible)[:target_per_class - n_accepted]
+        take_0 = np.flatnonzero(~eligible)[:target_per_class - n_rejected]
+        accepted.append(batch.iloc[take_1])
+        rejected.append(batch.iloc[take_0])
+        n_accepted += len(take_1)
+        n_rejected += len(take_0)
 
     # --- 4. Finalize DataFrame ---
-    columns = [
-        'age', 'marital_status', 'family_size', 'dependents', 'monthly_income', 
-        'total_savings', 'property_value', 'has_disability', 'medical_severity', 
-        'employment_status', 'label'
-    ]
-    df = pd.DataFrame(data, columns=columns)
+    df = pd.concat(accepted + rejected, ignore_index=True)
     
     # Shuffle so the model doesn't see all 1s then all 0s
-    return df.sample(frac=1).reset_index(drop=True)
+    return df.iloc[rng.permutation(len(df))].reset_index(drop=True)
 
 # Run and save
 df_balanced = generate_balanced_support_data(1000)
-df_balanced.to_csv('training_data/balanced_social_support_data.csv', index=False)
+# Write in large blocks rather than the default ~100-row chunks
+df_balanced.to_csv('training_data/balanced_social_support_data.csv', index=False, chunksize=65536)
 
 print("Dataset Generation Complete!")
 print(df_balanced['label'].value_counts())
\ No newline at end of file
@@ -1,20 +1,34 @@
 from sqlalchemy import inspect
 from models import engine, Base, init_db
 import os
-import shutil
+import sqlite3
 from datetime import datetime
 
+DB_FILE = 'sovereign_ai.db'
+
 def migrate_database():
     """Drop old table and recreate with new schema."""
     
     # Backup existing database
-    if os.path.exists('sovereign_ai.db'):
+    if os.path.exists(DB_FILE):
         backup_name = f"sovereign_ai_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        shutil.copy('sovereign_ai.db', backup_name)
+        # The database runs in WAL mode, so committed pages may still sit in
+        # the -wal file; SQLite's online backup copies a consistent snapshot
+        # including them, which a plain file copy would miss
+        src = sqlite3.connect(DB_FILE)
+        dst = sqlite3.connect(backup_name)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
         print(f"✅ Backup created: {backup_name}")
         
-        # Remove old database
-        os.remove('sovereign_ai.db')
+        # Remove old database with its WAL and shared-memory files, so stale
+        # pages are never replayed into the new database
+        for path in (DB_FILE, f"{DB_FILE}-wal", f"{DB_FILE}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
         print("✅ Old database removed")
     
     # Create new database with clean schema
@@ -1,5 +1,7 @@
 from .text_processing import (
     clean_val,
+    clean_vals,
+    extract_fields,
     extract_amount,
     extract_email,
     extract_number,
@@ -9,6 +11,8 @@ from .validators import (
     validate_emirates_id,
     validate_email,
     validate_phone,
+    validate_emirates_id_batch,
+    validate_phone_batch,
     validate_amount,
     validate_family_size
 )
@@ -16,6 +20,8 @@ from .validators import (
 __all__ = [
     # text_processing
     "clean_val",
+    "clean_vals",
+    "extract_fields",
     "extract_amount",
     "extract_email",
     "extract_number",
@@ -24,6 +30,8 @@ __all__ = [
     "validate_emirates_id",
     "validate_email",
     "validate_phone",
+    "validate_emirates_id_batch",
+    "validate_phone_batch",
     "validate_amount",
     "validate_family_size"
 ]
\ No newline at end of file
@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+
+import orjson
+
+
+def make_key(model: str, payload) -> str:
+    """
+    Build a cache key from the model name and a JSON-serializable payload.
+
+    The payload is hashed with SHA-256, so no applicant data is kept in
+    the key itself.
+
+    Example:
+        make_key("llama3.2:1b", {"Age": 30}) → "9f2c..."
+    """
+    canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.sha256(model.encode() + b"\x00" + canonical).hexdigest()
+
+
+class LLMCache:
+    """LRU cache with per-entry TTL for LLM responses."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> Future shared by concurrent misses
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """Return a cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: str, compute):
+        """
+        Return the cached value for key, or await compute() and cache it.
+
+        Concurrent misses for the same key share a single compute() call.
+        Exceptions are not cached.
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Zero-argument callable returning an awaitable
+
+        Returns:
+            Tuple of (value, hit)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+            self.put(key, value)
+            future.set_result(value)
+            return value, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not reported
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
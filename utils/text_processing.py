@@ -1,5 +1,21 @@
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+
+_CLEAN_RE = re.compile(r'[^\d.]')
+# Latin-1 translation table that drops everything except digits and '.'
+# (covers ASCII plus common currency signs such as £ and ¥)
+_CLEAN_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if chr(c) not in '0123456789.'))
+_FIELD_RE = re.compile(r'(Salary|Income|Savings|Value|Severity|Family):\s*([\d,.]+)')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+
+@lru_cache(maxsize=256)
+def _label_re(label: str, value_pattern: str) -> re.Pattern:
+    """Compiled "<label>: <value>" pattern, built once per label."""
+    return re.compile(rf"{re.escape(label)}:\s*{value_pattern}", re.IGNORECASE)
 
 def clean_val(val_str: str) -> float:
     """
@@ -12,10 +28,54 @@ def clean_val(val_str: str) -> float:
     """
     if not val_str:
         return 0.0
-    clean_num = re.sub(r'[^\d.]', '', str(val_str))
+    text = val_str if isinstance(val_str, str) else str(val_str)
+    clean_num = text.translate(_CLEAN_TABLE)
+    if not clean_num.isascii():
+        # Currency symbols or non-Latin digits: let the regex handle them
+        clean_num = _CLEAN_RE.sub('', clean_num)
     return float(clean_num) if clean_num else 0.0
 
 
+def clean_vals(values: Iterable) -> np.ndarray:
+    """
+    Batch version of clean_val for columns of formatted amounts.
+    
+    Parses straight into a float64 array, so no intermediate list of
+    Python floats is built.
+    
+    Example:
+        clean_vals(["AED 1,234.56", "", "99"]) → array([1234.56, 0., 99.])
+    """
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    return np.fromiter(map(clean_val, values), dtype=np.float64, count=len(values))
+
+
+def extract_fields(text: str) -> dict:
+    """
+    Extract all labelled numeric fields from a verification summary in one pass.
+    
+    Recognised labels: Salary, Income, Savings, Value, Severity, Family.
+    The first occurrence of each label wins.
+    
+    Example:
+        extract_fields("Salary: 5,000.00, Balance: 1,200.00") → {"Salary": 5000.0}
+    """
+    fields = {}
+    if not text:
+        return fields
+    for label, value in _FIELD_RE.findall(text):
+        if label in fields:
+            continue
+        # The capture is digits, commas and dots only, so dropping the
+        # commas is enough; no need for the general clean_val pass
+        try:
+            fields[label] = float(value.replace(',', ''))
+        except ValueError:
+            continue  # stray punctuation such as "." or "1.2.3"
+    return fields
+
+
 def extract_amount(text: str, pattern: str) -> str:
     """
     Extract currency amounts using regex pattern.
@@ -46,8 +106,7 @@ def extract_email(text: str) -> Optional[str]:
     """
     if not text:
         return None
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(email_pattern, text)
+    match = _EMAIL_RE.search(text)
     return match.group(0) if match else None
 
 
@@ -60,8 +119,7 @@ def extract_number(text: str, label: str) -> float:
     """
     if not text or not label:
         return 0.0
-    pattern = rf"{re.escape(label)}:\s*([\d,\.]+)"
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = _label_re(label, r"([\d,\.]+)").search(text)
     return clean_val(match.group(1)) if match else 0.0
 
 
@@ -74,8 +132,7 @@ def extract_text_after_label(text: str, label: str, max_length: int = 100) -> Op
     """
     if not text or not label:
         return None
-    pattern = rf"{re.escape(label)}:\s*(.*?)(?:\n|$)"
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = _label_re(label, r"(.*?)(?:\n|$)").search(text)
     if match:
         result = match.group(1).strip()
         return result[:max_length] if result else None
@@ -1,6 +1,31 @@
+import numbers
 import re
+from decimal import Decimal
 from typing import Tuple
 
+try:
+    import re2  # RE2 bindings; linear-time matching, no backtracking
+except ImportError:
+    re2 = None
+
+# Patterns compiled once at import. The email pattern checks user input, so
+# it runs on RE2 when installed to keep matching linear in the input length
+_EMAIL_PATTERN = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
+_EMAIL_RE = (re2 or re).compile(_EMAIL_PATTERN)
+# Formatting characters stripped from phone numbers: '-', '(', ')' and every
+# whitespace character (the highest one is U+3000, the ideographic space)
+_PHONE_FORMATTING = str.maketrans(dict.fromkeys(
+    '-()' + ''.join(ch for ch in map(chr, range(0x3001)) if ch.isspace())
+))
+
+# UAE mobile numbers: optional country/trunk prefix, then 5 and eight digits
+_PHONE_PREFIXES = ('+971', '00971', '0')
+_PHONE_LEADING = '5'
+_PHONE_LENGTH = 9
+
+# Shared success result of the tuple-returning validators
+_VALID = (True, "Valid")
+
 def validate_emirates_id(eid: str) -> bool:
     """
     Validate Emirates ID format.
@@ -12,7 +37,9 @@ def validate_emirates_id(eid: str) -> bool:
     """
     if not eid:
         return False
-    return bool(re.match(r'^\d{6,15}$', str(eid).strip()))
+    # Plain string checks; str.isdecimal accepts exactly what \d did
+    eid = str(eid).strip()
+    return 6 <= len(eid) <= 15 and eid.isdecimal()
 
 
 def validate_email(email: str) -> bool:
@@ -22,10 +49,17 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if not email:
+    if not email or not isinstance(email, str):
+        return False
+    # Cheap scans first; most malformed input is rejected without the regex.
+    # 254 characters is the RFC 5321 limit, as in the API model
+    n = len(email)
+    if n < 6 or n > 254:
         return False
-    pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$'
-    return bool(re.match(pattern, email))
+    at = email.find('@')
+    if at < 1 or email.find('.', at + 2) == -1:
+        return False
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_phone(phone: str) -> bool:
@@ -41,9 +75,48 @@ def validate_phone(phone: str) -> bool:
         return False
     phone = str(phone).strip()
     # Remove common formatting
-    phone = re.sub(r'[\s\-\(\)]', '', phone)
-    # Check patterns
-    return bool(re.match(r'^(\+971|00971|0)?5\d{8}$', phone))
+    phone = phone.translate(_PHONE_FORMATTING)
+    # Peel the optional country/trunk prefix, then expect 5 plus 8 digits
+    for prefix in _PHONE_PREFIXES:
+        if phone.startswith(prefix):
+            phone = phone[len(prefix):]
+            break
+    return len(phone) == _PHONE_LENGTH and phone.startswith(_PHONE_LEADING) and phone.isdecimal()
+
+
+def validate_emirates_id_batch(ids):
+    """
+    Validate a whole column of Emirates IDs at once.
+    
+    Same rules as validate_emirates_id, applied with pandas string methods
+    so bulk imports do not call the validator once per row.
+    
+    Args:
+        ids: pandas Series of IDs (strings or numbers; missing values fail)
+        
+    Returns:
+        Boolean Series aligned with ids
+    """
+    eids = ids.astype(str).str.strip()
+    return ids.notna() & eids.str.len().between(6, 15) & eids.str.isdecimal()
+
+
+def validate_phone_batch(phones):
+    """
+    Validate a whole column of UAE phone numbers at once.
+    
+    Same rules as validate_phone: formatting is stripped in one regex pass
+    over the column, then the whole number is matched against the accepted
+    prefixes.
+    
+    Args:
+        phones: pandas Series of phone numbers (missing values fail)
+        
+    Returns:
+        Boolean Series aligned with phones
+    """
+    digits = phones.astype(str).str.replace(r'[\s\-()]', '', regex=True)
+    return phones.notna() & digits.str.fullmatch(r'(?:\+971|00971|0)?5\d{8}')
 
 
 def validate_amount(amount: float, min_val: float = 0.0, max_val: float = float('inf')) -> Tuple[bool, str]:
@@ -53,14 +126,16 @@ def validate_amount(amount: float, min_val: float = 0.0, max_val: float = float(
     Returns:
         (is_valid, error_message)
     """
-    try:
-        if amount < min_val:
-            return False, f"Amount {amount} is below minimum {min_val}"
-        if amount > max_val:
-            return False, f"Amount {amount} exceeds maximum {max_val}"
-        return True, "Valid"
-    except Exception as e:
-        return False, f"Invalid amount: {e}"
+    # One type gate up front instead of a try/except around the comparisons.
+    # numbers.Real covers numpy scalars; Decimal (from the DB layer) is not
+    # registered as Real, so it is listed separately. bool is not an amount
+    if not isinstance(amount, (numbers.Real, Decimal)) or isinstance(amount, bool):
+        return False, f"Invalid amount: {amount!r} is not a number"
+    if amount < min_val:
+        return False, f"Amount {amount} is below minimum {min_val}"
+    if amount > max_val:
+        return False, f"Amount {amount} exceeds maximum {max_val}"
+    return _VALID
 
 
 def validate_family_size(size: int, max_size: int = 20) -> Tuple[bool, str]:
@@ -70,11 +145,9 @@ def validate_family_size(size: int, max_size: int = 20) -> Tuple[bool, str]:
     Returns:
         (is_valid, error_message)
     """
-    try:
-        if not isinstance(size, int) or size < 1:
-            return False, "Family size must be positive integer"
-        if size > max_size:
-            return False, f"Family size exceeds maximum {max_size}"
-        return True, "Valid"
-    except Exception as e:
-        return False, f"Invalid family size: {e}"
\ No newline at end of file
+    # Any integer type (numpy.int64 from DataFrames included), but not bool
+    if not isinstance(size, numbers.Integral) or isinstance(size, bool) or size < 1:
+        return False, "Family size must be positive integer"
+    if size > max_size:
+        return False, f"Family size exceeds maximum {max_size}"
+    return _VALID
\ No newline at end of file